@@ -0,0 +1,147 @@
+# ruff: noqa: T201, INP001, S608, SLF001
+"""Benchmark cache database writes against the original drop and refill.
+
+Writes to the temporary directory by default. Pass --dir to measure on
+other storage, such as the SD card. Run from the repository root:
+
+    python benchmarks/bench_cache_db.py --systems 8 --rows 10000
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import apsw
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src" / "aroma" / "aroma"))
+
+# pylint: disable=wrong-import-position,protected-access
+from manager.cache_manager import (
+    CREATE_TABLE,
+    INSERT_STATEMENT,
+    CacheManager,
+    CacheRow,
+)
+from shared.constants import CACHE_DB_WORKERS
+
+
+def _make_rows(system: str, count: int, tag: str = "") -> list[CacheRow]:
+    """Create synthetic cache rows for a system."""
+    return [
+        (
+            f"Game {i}{tag}",
+            f"/mnt/SDCARD/Roms/{system}/Folder {i % 40}/Game {i}.zip",
+            f"/mnt/SDCARD/Imgs/{system}/Game {i}.png",
+            0,
+            f"Folder {i % 40}",
+            f"Game {i}{tag}",
+            f"Game {i}{tag}",
+            f"Game {i}{tag}",
+        )
+        for i in range(count)
+    ]
+
+
+def _legacy_write(cache_db: Path, system: str, rows: list[CacheRow]) -> None:
+    """Replicate the original drop, recreate and refill of a table."""
+    with apsw.Connection(str(cache_db)) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {system}_roms")
+        cursor.execute(CREATE_TABLE % system)
+        cursor.executemany(INSERT_STATEMENT % system, rows)
+
+
+def _serial(systems: dict[str, list[CacheRow]], root: Path) -> None:
+    """Write every system one after another using the original method."""
+    for system, rows in systems.items():
+        _legacy_write(root / f"{system}_cache7.db", system, rows)
+
+
+def _aroma(systems: dict[str, list[CacheRow]], root: Path) -> None:
+    """Write every system on the cache manager worker pool."""
+    with ThreadPoolExecutor(max_workers=CACHE_DB_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                CacheManager._update_system,
+                root / f"{system}_cache7.db",
+                system,
+                rows,
+            )
+            for system, rows in systems.items()
+        ]
+        for future in futures:
+            future.result()
+
+
+def _time(func: Callable[[], None]) -> float:
+    """Return the elapsed time of a call."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _dump(root: Path, systems: dict[str, list[CacheRow]]) -> list[object]:
+    """Return the sorted rows of every cache table."""
+    result: list[object] = []
+    for system in systems:
+        with sqlite3.connect(root / f"{system}_cache7.db") as conn:
+            result.append(
+                sorted(
+                    conn.execute(
+                        "SELECT disp, path, imgpath, type, ppath, pinyin, "
+                        f"cpinyin, opinyin FROM {system}_roms"
+                    )
+                )
+            )
+    return result
+
+
+def main() -> None:
+    """Time full builds, small changes and unchanged refreshes."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--systems", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--dir", type=Path, default=None)
+    args = parser.parse_args()
+    systems = {
+        f"SYS{i}": _make_rows(f"SYS{i}", args.rows)
+        for i in range(args.systems)
+    }
+    small = dict(systems)
+    small["SYS1"] = systems["SYS1"][:-1] + _make_rows("SYS1", 1, " ")
+    changed = dict(systems)
+    changed["SYS0"] = _make_rows("SYS0", args.rows, " ")
+    with (
+        tempfile.TemporaryDirectory(dir=args.dir) as a,
+        tempfile.TemporaryDirectory(dir=args.dir) as b,
+    ):
+        legacy_root, aroma_root = Path(a), Path(b)
+        timings = [
+            (
+                name,
+                _time(partial(_serial, data, legacy_root)),
+                _time(partial(_aroma, data, aroma_root)),
+            )
+            for name, data in (
+                ("full build", systems),
+                ("unchanged", systems),
+                ("one change", small),
+                ("rebuild one", changed),
+            )
+        ]
+        if _dump(legacy_root, changed) != _dump(aroma_root, changed):
+            msg = "Cache tables differ from the original method"
+            raise RuntimeError(msg)
+    print(f"{'case':>12} {'legacy s':>9} {'aroma s':>9}")
+    for name, legacy, aroma in timings:
+        print(f"{name:>12} {legacy:>9.3f} {aroma:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# ruff: noqa: T201, INP001, S608, SLF001
+"""Benchmark frontend style queries against cache databases.
+
+Run from the repository root:
+
+    python benchmarks/bench_cache_queries.py --roms 5000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import apsw
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src" / "aroma" / "aroma"))
+
+# pylint: disable=wrong-import-position,protected-access
+from manager.cache_manager import CacheManager, CacheRow
+from shared.app_config import AppConfig
+
+SYSTEM = "SYS"
+QUERIES = {
+    "folder by disp": (
+        f"SELECT * FROM {SYSTEM}_roms WHERE ppath = ? ORDER BY disp"
+    ),
+    "folder by type": (
+        f"SELECT * FROM {SYSTEM}_roms WHERE ppath = ? ORDER BY type, disp"
+    ),
+    "folder count": f"SELECT COUNT(*) FROM {SYSTEM}_roms WHERE ppath = ?",
+    "rom by path": f"SELECT * FROM {SYSTEM}_roms WHERE path = ?",
+}
+
+
+def _make_rows(count: int, folders: int) -> list[CacheRow]:
+    """Create a ROM table with nested folders like a real cache."""
+    rows: list[CacheRow] = []
+    for i in range(folders):
+        parent = "." if i < folders // 4 else f"Folder {i % (folders // 4)}"
+        name = f"Folder {i}" if parent == "." else f"{parent}>Folder {i}"
+        path = f"/Roms/{name}"
+        rows.append((name, path, f"{path}/_root.png", 1, parent, "", "", ""))
+    for i in range(count):
+        parent = rows[i % folders][0]
+        name = f"Game {count - i:05d}"
+        path = f"/Roms/{parent}/{name}.zip"
+        rows.append(
+            (name, path, f"/Imgs/{name}.png", 0, parent, name, name, name)
+        )
+    return rows
+
+
+def _time_queries(
+    cache_db: Path, rows: list[CacheRow], repeat: int
+) -> dict[str, float]:
+    """Return the mean milliseconds of each query over every argument."""
+    args = {
+        "folder by disp": [(r[0],) for r in rows if r[3] == 1],
+        "folder by type": [(r[0],) for r in rows if r[3] == 1],
+        "folder count": [(r[0],) for r in rows if r[3] == 1],
+        "rom by path": [(r[1],) for r in rows[:: max(len(rows) // 200, 1)]],
+    }
+    timings = {}
+    with apsw.Connection(str(cache_db)) as conn:
+        cursor = conn.cursor()
+        for name, query in QUERIES.items():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for arg in args[name]:
+                    cursor.execute(query, arg).fetchall()
+            elapsed = time.perf_counter() - start
+            timings[name] = elapsed * 1000 / (repeat * len(args[name]))
+    return timings
+
+
+def main() -> None:
+    """Build a cache with and without indexes and time folder queries."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--roms", type=int, default=5000)
+    parser.add_argument("--folders", type=int, default=80)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    rows = _make_rows(args.roms, args.folders)
+    results = {}
+    with tempfile.TemporaryDirectory() as temp:
+        for indexed in (False, True):
+            AppConfig().cache_db_indexes = indexed
+            cache_db = Path(temp) / f"{indexed}_cache7.db"
+            start = time.perf_counter()
+            CacheManager._update_system(cache_db, SYSTEM, rows)
+            build = time.perf_counter() - start
+            results[indexed] = (
+                build,
+                cache_db.stat().st_size,
+                _time_queries(cache_db, rows, args.repeat),
+            )
+    print(f"{'':>16} {'plain':>10} {'indexed':>10}")
+    print(
+        f"{'build s':>16} {results[False][0]:>10.3f} {results[True][0]:>10.3f}"
+    )
+    print(
+        f"{'size KiB':>16} {results[False][1] // 1024:>10} "
+        f"{results[True][1] // 1024:>10}"
+    )
+    for name in QUERIES:
+        print(
+            f"{name + ' ms':>16} {results[False][2][name]:>10.3f} "
+            f"{results[True][2][name]:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+# ruff: noqa: T201, INP001, S311, SLF001
+"""Benchmark cache row generation against the original per row paths.
+
+Run from the repository root:
+
+    python benchmarks/bench_cache_rows.py --roms 50000
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src" / "aroma" / "aroma"))
+
+# pylint: disable=wrong-import-position,protected-access
+from data.model.launchable_detail import LaunchableDetail, LaunchableType
+from data.model.name_format import NameFormat
+from data.model.rom_detail import RomDetail
+from manager.cache_manager import CacheManager, CacheRow
+from shared.app_config import AppConfig
+from shared.constants import (
+    APP_NAME,
+    ARCADE_NAMING_SYSTEMS,
+    EMU_PATH,
+    ROM_PATH,
+)
+
+SYSTEMS = ["GBA", "PS", "SFC", "FBNEO", "MAME2003PLUS"]
+FOLDERS = ["Action", "RPG", "Hacks", "Japan", "A-Z", "Best Of", "v1.0"]
+FILES = ["{} (USA).zip", "{}.v64", "{}", ".{}", "{}.", "{}.tar.gz"]
+
+
+@dataclass
+class _LegacyRowEntry:  # pylint: disable=too-many-instance-attributes
+    """Replicate the original per row path handling."""
+
+    raw_path: Path
+    _name: str
+    _is_dir: bool = False
+    _launchable_item: LaunchableDetail | None = None
+    is_valid_dir: bool = False
+    _ignore_ancestors: int | None = None
+
+    def __post_init__(self) -> None:
+        with suppress(ValueError):
+            self._ignore_ancestors = self.raw_path.parts.index("Roms") + 1
+            if self.raw_path.is_relative_to(ROM_PATH):
+                self._ignore_ancestors += 1
+        if (
+            self._is_dir
+            and self._ignore_ancestors
+            and self.raw_path.parts[self._ignore_ancestors :]
+        ):
+            self.is_valid_dir = True
+
+    def _is_arcade_rom(self) -> bool:
+        return (
+            self._launchable_item is not None
+            and self._launchable_item.item_type == LaunchableType.ROM
+            and self._launchable_item.parent in ARCADE_NAMING_SYSTEMS
+        )
+
+    @property
+    def display_name(self) -> str:
+        """Return the display name of the ROM or directory."""
+        if self._is_dir:
+            return self._get_dir_string()
+        if self._is_arcade_rom():
+            return f"{self._name} "
+        return self._name
+
+    def _get_dir_string(self, *, exclude_self: bool = False) -> str:
+        if not self._ignore_ancestors:
+            return "."
+        if exclude_self:
+            return (
+                ">".join(self.raw_path.parts[self._ignore_ancestors : -1])
+                or "."
+            )
+        return ">".join(self.raw_path.parts[self._ignore_ancestors :]) or "."
+
+    @property
+    def rom_path(self) -> str:
+        """Return the ROM file path."""
+        if (
+            self._launchable_item is None
+            or self._launchable_item.item_type == LaunchableType.SHORTCUT
+        ):
+            return str(self.raw_path)
+        return str(
+            EMU_PATH
+            / self._launchable_item.parent
+            / ".."
+            / ".."
+            / "Roms"
+            / self._launchable_item.item_path
+        )
+
+    @property
+    def img_path(self) -> str:
+        """Return the image path for the ROM or directory."""
+        if self._is_dir or not self._launchable_item:
+            return str(self.raw_path / "_root.png")
+        return str(self._launchable_item.get_image_path())
+
+    @property
+    def type(self) -> int:
+        """Return the type, 1 for directory, 0 for ROM."""
+        return 1 if self._is_dir else 0
+
+    @property
+    def parent_path(self) -> str:
+        """Return the parent directory path."""
+        return self._get_dir_string(exclude_self=True)
+
+    def to_db_tuple(self) -> CacheRow:
+        """Generate a tuple for database insertion."""
+        return (
+            self.display_name,
+            self.rom_path,
+            self.img_path,
+            self.type,
+            self.parent_path,
+            "" if self._is_dir else self.display_name,
+            "" if self._is_dir else self.display_name,
+            "" if self._is_dir else self.opinyin,
+        )
+
+    def to_name_tuple(self, row_id: int) -> tuple[str, str, str, str, int]:
+        """Generate a tuple for updating the names of a database row."""
+        return (
+            self.display_name,
+            self.display_name,
+            self.display_name,
+            self.opinyin,
+            row_id,
+        )
+
+    @property
+    def opinyin(self) -> str:
+        """Return the pinyin value for the ROM or directory."""
+        if self._is_arcade_rom():
+            return f"{APP_NAME}_{self.raw_path.stem}"
+        return self.display_name
+
+
+def _legacy_rows(
+    launchables: dict[str, LaunchableDetail],
+) -> dict[str, list[CacheRow]]:
+    """Replicate the original ROM and directory row generation."""
+    parent_dict: dict[str, list[_LegacyRowEntry]] = {}
+    name_format = NameFormat.compile(AppConfig().name_format)
+    for launchable in launchables.values():
+        parent_dict.setdefault(launchable.parent, []).append(
+            _LegacyRowEntry(
+                launchable.full_path,
+                launchable.format_name(name_format),
+                _launchable_item=launchable,
+            )
+        )
+    for parent, rows in parent_dict.items():
+        dirs = {ancestor for r in rows for ancestor in r.raw_path.parents}
+        for i in sorted(dirs):
+            dir_entry = _LegacyRowEntry(i, i.name, _is_dir=True)
+            if dir_entry.is_valid_dir:
+                parent_dict.setdefault(parent, []).append(dir_entry)
+    return {
+        parent: [r.to_db_tuple() for r in rows]
+        for parent, rows in parent_dict.items()
+    }
+
+
+def _trie_rows(
+    launchables: dict[str, LaunchableDetail],
+) -> dict[str, list[CacheRow]]:
+    """Generate rows through the cache manager directory trie."""
+    return {
+        parent: system.to_db_tuples()
+        for parent, system in CacheManager._generate_launchable_rows(
+            launchables
+        ).items()
+    }
+
+
+def _make_launchables(count: int) -> dict[str, LaunchableDetail]:
+    """Create ROMs spread across deep folder hierarchies."""
+    rng = random.Random(1)
+    launchables: dict[str, LaunchableDetail] = {}
+    for i in range(count):
+        system = rng.choice(SYSTEMS)
+        folders = [rng.choice(FOLDERS) for _ in range(rng.randint(0, 6))]
+        name = f"Game {i}"
+        item_path = "/".join(
+            [system, *folders, rng.choice(FILES).format(name)]
+        )
+        launchables[item_path] = RomDetail(
+            name=name,
+            parent=system,
+            item_path=item_path,
+            title=name,
+            source="No-Intro",
+        )
+    return launchables
+
+
+def _measure(
+    func: Callable[[dict[str, LaunchableDetail]], Any],
+    launchables: dict[str, LaunchableDetail],
+) -> tuple[float, int, Any]:
+    """Return the elapsed time, peak allocation and result of a call."""
+    tracemalloc.start()
+    result = func(launchables)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    func(launchables)
+    return time.perf_counter() - start, peak, result
+
+
+def main() -> None:
+    """Check both generators agree, then time them and trace allocations."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--roms", type=int, default=50000)
+    args = parser.parse_args()
+    AppConfig().name_format = "$n"
+    launchables = _make_launchables(args.roms)
+    timings = {
+        name: _measure(func, launchables)
+        for name, func in (("legacy", _legacy_rows), ("trie", _trie_rows))
+    }
+    if timings["legacy"][2] != timings["trie"][2]:
+        msg = "Generated cache rows differ from the original method"
+        raise RuntimeError(msg)
+    rows = sum(len(r) for r in timings["trie"][2].values())
+    print(f"{len(launchables)} ROMs, {rows} rows")
+    print(f"{'method':>8} {'seconds':>9} {'peak MiB':>9}")
+    for name, (elapsed, peak, _) in timings.items():
+        print(f"{name:>8} {elapsed:>9.3f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
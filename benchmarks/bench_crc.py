@@ -0,0 +1,102 @@
+# ruff: noqa: T201, INP001
+"""Benchmark streaming CRC32 hashing against whole-file reads.
+
+Run from the repository root on a Linux host:
+
+    python benchmarks/bench_crc.py --max-mb 1024
+"""
+
+import argparse
+import binascii
+import multiprocessing as mp
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src" / "aroma" / "aroma"))
+
+# pylint: disable=wrong-import-position
+from shared.tools import util
+
+SIZES_MB = [1, 16, 64, 256, 512, 1024]
+CHUNK = 1024 * 1024
+
+
+def _legacy_crc(path: Path) -> str:
+    """Replicate the original whole-file read implementation."""
+    with path.open("rb") as f:
+        data = f.read()
+    return f"{binascii.crc32(data) & 0xFFFFFFFF:08x}"
+
+
+def _streaming_crc(path: Path, buffer_size: int) -> str:
+    """Call the streaming implementation."""
+    return util.check_crc(path, buffer_size)
+
+
+def _worker(
+    method: str, path: Path, buffer_size: int, queue: "mp.Queue[object]"
+) -> None:
+    """Hash a file in a fresh process and report time and peak RSS."""
+    start = time.perf_counter()
+    if method == "legacy":
+        crc = _legacy_crc(path)
+    else:
+        crc = _streaming_crc(path, buffer_size)
+    elapsed = time.perf_counter() - start
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((crc, elapsed, rss_kb))
+
+
+def _run(method: str, path: Path, buffer_size: int) -> tuple[str, float, int]:
+    """Run a single measurement in an isolated process."""
+    ctx = mp.get_context("spawn")
+    queue: mp.Queue[object] = ctx.Queue()
+    proc = ctx.Process(target=_worker, args=(method, path, buffer_size, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result  # type: ignore[return-value]
+
+
+def _make_file(directory: Path, size_mb: int) -> Path:
+    """Create a synthetic file of the requested size."""
+    path = directory / f"synthetic_{size_mb}mb.bin"
+    block = bytes(range(256)) * (CHUNK // 256)
+    with path.open("wb") as f:
+        for _ in range(size_mb):
+            f.write(block)
+    return path
+
+
+def main() -> None:
+    """Run the benchmark over synthetic files."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-mb", type=int, default=1024)
+    parser.add_argument("--buffer-kb", type=int, default=1024)
+    args = parser.parse_args()
+    buffer_size = args.buffer_kb * 1024
+    print(
+        f"{'size':>8} {'method':>10} {'MB/s':>10} {'peak RSS MB':>12}",
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in [s for s in SIZES_MB if s <= args.max_mb]:
+            path = _make_file(Path(tmp), size_mb)
+            results = {}
+            for method in ("legacy", "streaming"):
+                crc, elapsed, rss_kb = _run(method, path, buffer_size)
+                results[method] = crc
+                print(
+                    f"{size_mb:>6}MB {method:>10} "
+                    f"{size_mb / elapsed:>10.1f} {rss_kb / 1024:>12.1f}"
+                )
+            if results["legacy"] != results["streaming"]:
+                msg = f"CRC mismatch for {size_mb}MB file"
+                raise RuntimeError(msg)
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
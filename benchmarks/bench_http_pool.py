@@ -0,0 +1,132 @@
+# ruff: noqa: T201, INP001, S603, S607
+"""Benchmark pooled keep-alive requests against a new connection per call.
+
+Starts a local HTTPS stand-in for ScreenScraper with a self signed
+certificate trusted by the benchmark's sessions only (requires the openssl
+command). Run from the repository root:
+
+    python benchmarks/bench_http_pool.py --requests 2000 --threads 8
+"""
+
+import argparse
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src" / "aroma" / "aroma"))
+
+# pylint: disable=wrong-import-position
+from data.tools.http_request_handler import HttpRequestHandler
+from shared.app_config import AppConfig
+
+BODY = b'{"response": {"jeu": {"medias": []}}}'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answer every GET with a small JSON body over keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def do_GET(self) -> None:
+        """Send the canned response."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *_: object) -> None:
+        """Silence request logging."""
+
+
+def _make_certificate(folder: Path) -> tuple[Path, Path]:
+    """Create a self signed certificate for the loopback address."""
+    cert, key = folder / "cert.pem", folder / "key.pem"
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-addext",
+            "subjectAltName=IP:127.0.0.1,DNS:localhost",
+            "-keyout",
+            str(key),
+            "-out",
+            str(cert),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+def _run(
+    get: Callable[[str], object], url: str, count: int, threads: int
+) -> float:
+    """Return the requests per second of a GET function across threads."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for response in executor.map(get, [url] * count):
+            if response is None:
+                msg = "Request failed"
+                raise RuntimeError(msg)
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Time unpooled and pooled GETs against a local HTTPS server."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+    AppConfig()._scrape_cpu_threads = args.threads  # noqa: SLF001  # pylint: disable=protected-access
+    with tempfile.TemporaryDirectory() as temp:
+        cert, key = _make_certificate(Path(temp))
+        session = HttpRequestHandler.session()
+        session.trust_env = False  # ignore any REQUESTS_CA_BUNDLE override
+        session.verify = str(cert)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        server.daemon_threads = True
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"https://127.0.0.1:{server.server_port}/api2/jeuInfos.php"
+        results = {
+            "per call": _run(
+                lambda u: requests.get(u, timeout=10, verify=str(cert)),
+                url,
+                args.requests,
+                args.threads,
+            ),
+            "pooled": _run(
+                HttpRequestHandler.get, url, args.requests, args.threads
+            ),
+        }
+        server.shutdown()
+    print(f"{args.requests} requests on {args.threads} threads")
+    print(f"{'method':>9} {'req/s':>9}")
+    for name, rate in results.items():
+        print(f"{name:>9} {rate:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# ruff: noqa: T201, INP001, S311
+"""Benchmark speculative media lookups against the sequential fallbacks.
+
+Simulates lookups with a fixed latency and per strategy success rates, the
+same outcomes being replayed for both approaches. Run from the repository
+root:
+
+    python benchmarks/bench_lookup_planner.py --roms 300 --latency 20
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src" / "aroma" / "aroma"))
+
+# pylint: disable=wrong-import-position
+from data.model.media_item import MediaItem
+from data.tools.lookup_planner import Lookup, LookupPlanner
+
+STRATEGIES = {"crc": 0.15, "name": 0.6, "filename": 0.5, "any_system": 0.3}
+
+
+class _Counter:
+    """Count the simulated requests that were actually sent."""
+
+    def __init__(self) -> None:
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def add(self) -> None:
+        """Count one request."""
+        with self._lock:
+            self.value += 1
+
+
+def _outcomes(roms: int, seed: int) -> list[list[bool]]:
+    """Decide which strategies succeed for every ROM."""
+    rng = random.Random(seed)
+    return [
+        [rng.random() < rate for rate in STRATEGIES.values()]
+        for _ in range(roms)
+    ]
+
+
+def _fetch(
+    index: int, latency: float, counter: _Counter, *, success: bool
+) -> list[MediaItem]:
+    """Simulate one lookup round trip."""
+    counter.add()
+    time.sleep(latency)
+    return [MediaItem("box", str(index), "wor")] if success else []
+
+
+def _sequential(
+    outcomes: list[list[bool]], latency: float
+) -> tuple[list[str | None], list[float], int]:
+    """Run each ROM's lookups one after another until one succeeds."""
+    counter = _Counter()
+    results: list[str | None] = []
+    timings: list[float] = []
+    for row in outcomes:
+        start = time.perf_counter()
+        result = None
+        for i, success in enumerate(row):
+            if result := _fetch(i, latency, counter, success=success):
+                break
+        timings.append(time.perf_counter() - start)
+        results.append(result[0].url if result else None)
+    return results, timings, counter.value
+
+
+async def _planned(
+    outcomes: list[list[bool]], latency: float, budget: int
+) -> tuple[list[str | None], list[float], int]:
+    """Resolve each ROM's lookups with the speculative planner."""
+    counter = _Counter()
+    planner = LookupPlanner()
+    results: list[str | None] = []
+    timings: list[float] = []
+    with ThreadPoolExecutor(max_workers=budget * 2) as executor:
+        for row in outcomes:
+            lookups = [
+                Lookup(
+                    strategy,
+                    lambda i=i, s=s: _fetch(i, latency, counter, success=s),
+                )
+                for i, (strategy, s) in enumerate(
+                    zip(STRATEGIES, row, strict=True)
+                )
+            ]
+            start = time.perf_counter()
+            result = await planner.resolve("GBA", lookups, executor, budget)
+            timings.append(time.perf_counter() - start)
+            results.append(result[0].url if result else None)
+    return results, timings, counter.value
+
+
+def main() -> None:
+    """Compare per ROM latency and request counts."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--roms", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=20, help="ms")
+    parser.add_argument("--budget", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    outcomes = _outcomes(args.roms, args.seed)
+    latency = args.latency / 1000
+    seq = _sequential(outcomes, latency)
+    plan = asyncio.run(_planned(outcomes, latency, args.budget))
+    if seq[0] != plan[0]:
+        msg = "Planned lookups chose different results to the sequential ones"
+        raise RuntimeError(msg)
+
+    for label, (_, timings, requests) in (
+        ("sequential", seq),
+        (f"planner budget={args.budget}", plan),
+    ):
+        print(
+            f"{label:<20} median {statistics.median(timings) * 1000:7.1f} ms"
+            f"  mean {statistics.mean(timings) * 1000:7.1f} ms"
+            f"  requests {requests}"
+        )
+
+
+if __name__ == "__main__":
+    main()
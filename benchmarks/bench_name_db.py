@@ -0,0 +1,165 @@
+# ruff: noqa: T201, INP001, S311, S608, SLF001
+"""Benchmark NameDB matching against the original per-table queries.
+
+Run from the repository root:
+
+    python benchmarks/bench_name_db.py --rows 200000
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import apsw
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src" / "aroma" / "aroma"))
+
+# pylint: disable=wrong-import-position,protected-access
+from data.source.name_db import NameDB
+from shared.constants import CONSOLE_ID_METHOD
+from shared.tools.enhanced_json_encoder import EnhancedJSONEncoder
+
+SIZES = [1000, 10000, 50000]
+SUBTABLES = ("region", "disc", "format", "additional")
+REGIONS = ["USA", "Europe", "Japan", "World"]
+
+
+def _make_db(path: Path, rows: int) -> list[str]:
+    """Create a synthetic names database and return its CRC values."""
+    rng = random.Random(1)
+    vals = [f"{rng.getrandbits(32):08x}" for _ in range(rows)]
+    with apsw.Connection(str(path)) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            CREATE TABLE rom (
+                id INTEGER PRIMARY KEY, title TEXT, name TEXT, source TEXT,
+                val TEXT, hack TEXT, version TEXT, year TEXT
+            );
+            CREATE INDEX rom_val ON rom (val);
+            """
+        )
+        for table in SUBTABLES:
+            cursor.execute(f"CREATE TABLE {table} (rom_id INTEGER, name TEXT)")
+        with conn:
+            cursor.executemany(
+                "INSERT INTO rom VALUES (?, ?, ?, ?, ?, NULL, NULL, ?)",
+                [
+                    (i, f"Game {i}", f"Game {i}", "No-Intro", v, "1990")
+                    for i, v in enumerate(vals, 1)
+                ],
+            )
+            cursor.executemany(
+                "INSERT INTO region VALUES (?, ?)",
+                [
+                    (i, r)
+                    for i in range(1, rows + 1)
+                    for r in rng.sample(REGIONS, rng.randint(1, 2))
+                ],
+            )
+            cursor.executemany(
+                "INSERT INTO additional VALUES (?, ?)",
+                [(i, "Rev 1") for i in range(1, rows + 1, 7)],
+            )
+    return vals
+
+
+def _legacy_query(
+    cursor: apsw.Cursor, query_vals: dict[str, list[str]]
+) -> dict[str, dict[str, object]]:
+    """Replicate the original placeholder list and list index matching."""
+    terms = list({v for vals in query_vals.values() for v in vals})
+    cursor.execute(
+        "SELECT id, title, name, source, val, hack, version, year FROM rom "
+        f"WHERE val IN ({', '.join('?' for _ in terms)})",
+        terms,
+    )
+    roms = cursor.fetchall()
+    row_ids = [r[0] for r in roms]
+    subtables: dict[str, dict[int, list[str]]] = {}
+    for table in SUBTABLES:
+        target = subtables.setdefault(table, {})
+        cursor.execute(
+            f"SELECT rom_id, name FROM {table} "
+            f"WHERE rom_id IN ({', '.join('?' for _ in row_ids)})",
+            row_ids,
+        )
+        for row_id, name in cursor.fetchall():
+            target.setdefault(row_id, []).append(name)
+    processed: dict[str, dict[str, object]] = {}
+    black_list: set[str] = set()
+    for path, ids in query_vals.items():
+        for rom_id in ids:
+            if rom_id not in [r[4] for r in roms] or path in black_list:
+                continue
+            if path in processed:
+                black_list.add(path)
+                processed.pop(path)
+                continue
+            rom = roms[[r[4] for r in roms].index(rom_id)]
+            processed[path] = {
+                "name": rom[2],
+                "title": rom[1],
+                "id": rom[4],
+                **{t: subtables[t].get(rom[0], []) for t in SUBTABLES},
+            }
+    return processed
+
+
+def _normalize(processed: dict[str, object]) -> dict[str, dict[str, object]]:
+    """Reduce results to the fields compared between implementations."""
+    data = json.loads(json.dumps(processed, cls=EnhancedJSONEncoder))
+    return {
+        k: {
+            "name": v["name"],
+            "title": v["title"],
+            "id": v["id"],
+            **{t: v.get(t, []) for t in SUBTABLES},
+        }
+        for k, v in data.items()
+    }
+
+
+def main() -> None:
+    """Time both implementations at increasing query sizes."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+    rng = random.Random(2)
+    print(f"{'queries':>8} {'legacy s':>10} {'joined s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "console.db"
+        vals = _make_db(db, args.rows)
+        for size in SIZES:
+            query_vals = {
+                f"GBA/Game {i}.gba": [
+                    rng.choice(vals) if i % 5 else f"{rng.getrandbits(32):08x}"
+                ]
+                for i in range(size)
+            }
+            with apsw.Connection(str(db)) as conn:
+                start = time.perf_counter()
+                joined = NameDB._run_query(
+                    conn.cursor(), query_vals, CONSOLE_ID_METHOD
+                )
+                joined_time = time.perf_counter() - start
+                start = time.perf_counter()
+                try:
+                    legacy = _legacy_query(conn.cursor(), query_vals)
+                except apsw.SQLError as e:
+                    print(f"{size:>8} {'failed':>10} {joined_time:>10.3f}")
+                    print(f"         legacy query failed: {e}")
+                    continue
+                legacy_time = time.perf_counter() - start
+            if _normalize(legacy) != _normalize(joined):  # type: ignore[arg-type]
+                msg = f"Result mismatch at {size} queries"
+                raise RuntimeError(msg)
+            print(f"{size:>8} {legacy_time:>10.3f} {joined_time:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
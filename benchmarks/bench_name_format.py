@@ -0,0 +1,133 @@
+# ruff: noqa: T201, INP001, S311, SLF001
+"""Benchmark compiled name formats against per ROM string replacement.
+
+Run from the repository root:
+
+    python benchmarks/bench_name_format.py --entries 50000
+"""
+
+import argparse
+import itertools
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src" / "aroma" / "aroma"))
+
+# pylint: disable=wrong-import-position,protected-access
+from data.model.name_format import NAMING_FIELD_IDS, NameFormat
+from data.model.rom_detail import RomDetail
+from shared.app_config import AppConfig
+
+WRAPPERS = ["{}", "({})", "[{}]", "{{{}}}", " {} ", "-{}"]
+NAMES = ["Game", "Ca$h Rally", "$n Tricks", "Hello (World)", "Dr. [Mario]"]
+REGIONS = [(), ("USA",), ("Japan", "USA"), ("Europe", "Australia")]
+DISCS = [(), ("DISC 1",), ("SIDE A", "DISC 2")]
+FORMATS = [(), ("PAL",), ("NTSC", "PAL")]
+ADDITIONAL = [(), ("Beta",), ("Proto", "Rev 1"), ("$t",)]
+OPTIONAL = [None, "", "1995", "v1.1", "()", "$y"]
+
+
+def _legacy_format(rom: RomDetail, format_string: str | None = None) -> str:
+    """Replicate the original sequential replacement."""
+    formats = {
+        "$t": rom.title,
+        "$n": rom.name,
+        "$r": rom._format_region,
+        "$d": rom._format_disc,
+        "$f": rom._format_vformat,
+        "$h": rom.hack or "",
+        "$v": rom.version or "",
+        "$y": rom.year or "",
+        "$a": rom._format_additional,
+    }
+    result = format_string or AppConfig().name_format
+    for k, v in formats.items():
+        result = result.replace(k, v)
+    for s in ["[]", "()", r"{}"]:
+        result = result.replace(s, "")
+    result = re.sub(r"\s+", " ", result)
+    return result.strip()
+
+
+def _make_roms(count: int, *, with_ids: bool) -> list[RomDetail]:
+    """Create synthetic ROM details, optionally containing field ids."""
+    rng = random.Random(1)
+
+    def pick(values: list[Any]) -> Any:  # noqa: ANN401
+        return rng.choice([v for v in values if with_ids or "$" not in str(v)])
+
+    roms = []
+    for i in range(count):
+        name = f"{pick(NAMES)} {i % 300}"
+        roms.append(
+            RomDetail(
+                name=name,
+                parent="GBA",
+                item_path=f"GBA/{name}.zip",
+                title=f"{name}  (USA)",
+                source="No-Intro",
+                region=pick(REGIONS),
+                disc=pick(DISCS),
+                format=pick(FORMATS),
+                additional=pick(ADDITIONAL),
+                hack=pick(OPTIONAL),
+                version=pick(OPTIONAL),
+                year=pick(OPTIONAL),
+            )
+        )
+    return roms
+
+
+def _make_templates() -> list[str]:
+    """Create a template for every combination of field ids."""
+    rng = random.Random(2)
+    templates = ["", "$", "$$n", "$t$", "$x $n", "$n ($r) $$"]
+    templates.extend(
+        "".join(
+            rng.choice(WRAPPERS).format(i) for i in rng.sample(ids, len(ids))
+        )
+        for size in range(len(NAMING_FIELD_IDS) + 1)
+        for ids in itertools.combinations(NAMING_FIELD_IDS, size)
+    )
+    return templates
+
+
+def main() -> None:
+    """Check compiled output is identical, then time bulk formatting."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=50000)
+    args = parser.parse_args()
+    templates = _make_templates()
+    for template in templates:
+        name_format = NameFormat.compile(template)
+        for rom in _make_roms(200, with_ids=True):
+            if rom.format_name(name_format) != _legacy_format(rom, template):
+                msg = f"Formatted name differs for {template!r}"
+                raise RuntimeError(msg)
+    roms = _make_roms(args.entries, with_ids=False)
+    AppConfig().name_format = "$n [$r] ($d) {$v} $a"
+    start = time.perf_counter()
+    legacy = [_legacy_format(r) for r in roms]
+    legacy_time = time.perf_counter() - start
+    start = time.perf_counter()
+    name_format = NameFormat.compile(AppConfig().name_format)
+    compiled = [r.format_name(name_format) for r in roms]
+    compiled_time = time.perf_counter() - start
+    if legacy != compiled:
+        msg = "Bulk formatted names differ"
+        raise RuntimeError(msg)
+    print(f"checked {len(templates)} templates")
+    print(f"{'method':>10} {'seconds':>9} {'names/s':>10}")
+    for name, elapsed in (
+        ("legacy", legacy_time),
+        ("compiled", compiled_time),
+    ):
+        print(f"{name:>10} {elapsed:>9.3f} {len(roms) / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# ruff: noqa: T201, INP001, S311
+"""Benchmark the memory footprint of an in-memory ROM database.
+
+Run from the repository root:
+
+    python benchmarks/bench_rom_detail.py --entries 50000
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src" / "aroma" / "aroma"))
+
+# pylint: disable=wrong-import-position
+from data.model.rom_detail import RomDetail
+from shared.constants import FILE_ID_METHOD, ROM_PATH
+from shared.tools.enhanced_json_encoder import EnhancedJSONEncoder
+
+SYSTEMS = ["GBA", "GB", "GBC", "MD", "NES", "SFC", "PS", "N64"]
+REGIONS = [["USA"], ["Europe"], ["Japan"], ["USA", "Europe"], ["World"]]
+FORMATS = [[], [], ["NTSC"], ["PAL"]]
+ADDITIONAL = [[], [], ["Beta"], ["Proto"], ["Rev 1"]]
+
+
+@dataclass
+class _LegacyRomDetail:  # pylint: disable=too-many-instance-attributes
+    """Replicate the original RomDetail layout."""
+
+    name: str
+    parent: str
+    item_path: str
+    title: str
+    source: str
+    id_method: str = ""
+    id: str = ""
+    region: list[str] = field(default_factory=list)
+    disc: list[str] = field(default_factory=list)
+    format: list[str] = field(default_factory=list)
+    hack: str | None = None
+    version: str | None = None
+    year: str | None = None
+    additional: list[str] = field(default_factory=list)
+    base_path: Path = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Set the base path as the original class did."""
+        self.base_path = ROM_PATH
+
+
+def _make_rows(count: int) -> list[str]:
+    """Create serialized rows as read back from the ROM store."""
+    rng = random.Random(1)
+    rows = []
+    for i in range(count):
+        system = rng.choice(SYSTEMS)
+        crc = f"{rng.getrandbits(32):08x}"
+        file_id = i % 4 == 0
+        row: dict[str, Any] = {
+            "name": f"Game {i}",
+            "parent": system,
+            "item_path": f"{system}/Game {i} (USA).zip",
+            "title": f"Game {i} (USA)",
+            "source": "file_name" if file_id else "No-Intro",
+            "id_method": FILE_ID_METHOD if file_id else "db_crc",
+            "id": str([crc]) if file_id else crc,
+            "region": rng.choice(REGIONS),
+            "format": rng.choice(FORMATS),
+            "additional": rng.choice(ADDITIONAL),
+            "year": str(1985 + i % 30),
+        }
+        rows.append(json.dumps({k: v for k, v in row.items() if v}))
+    return rows
+
+
+def _measure(
+    factory: Callable[..., object], rows: list[str]
+) -> tuple[list[object], int, int]:
+    """Build a database from rows and return retained and peak bytes."""
+    gc.collect()
+    tracemalloc.start()
+    db = [factory(**json.loads(row)) for row in rows]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return db, current, peak
+
+
+def main() -> None:
+    """Compare the legacy and compact layouts."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=50000)
+    args = parser.parse_args()
+    rows = _make_rows(args.entries)
+    print(f"{'layout':>8} {'retained MB':>12} {'peak MB':>10}")
+    results = {}
+    for name, factory in (
+        ("legacy", _LegacyRomDetail),
+        ("compact", RomDetail),
+    ):
+        db, current, peak = _measure(factory, rows)
+        results[name] = db
+        print(f"{name:>8} {current / 2**20:>12.1f} {peak / 2**20:>10.1f}")
+    legacy, compact = results["legacy"], results["compact"]
+    for old, new in zip(legacy, compact, strict=True):
+        old_data = {
+            k: v for k, v in vars(old).items() if v and k != "base_path"
+        }
+        new_data = json.loads(json.dumps(new, cls=EnhancedJSONEncoder))
+        if old_data != new_data:
+            msg = f"Serialization mismatch: {old_data} != {new_data}"
+            raise RuntimeError(msg)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# ruff: noqa: T201, INP001, S311
+"""Benchmark ROM detail serialization against the asdict based encoder.
+
+Run from the repository root:
+
+    python benchmarks/bench_serialize.py --entries 50000
+"""
+
+import argparse
+import dataclasses
+import json
+import random
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src" / "aroma" / "aroma"))
+
+# pylint: disable=wrong-import-position
+from data.model.rom_detail import RomDetail
+from shared.constants import FILE_ID_METHOD
+from shared.tools.enhanced_json_encoder import (
+    EXCLUDE_FROM_SERIALIZATION,
+    SERIALIZATION_OVERRIDES,
+    EnhancedJSONEncoder,
+    dataclass_to_dict,
+)
+
+SYSTEMS = ["GBA", "GB", "GBC", "MD", "NES", "SFC", "PS", "N64"]
+REGIONS = [["USA"], ["Europe"], ["Japan"], ["USA", "Europe"], ["World"]]
+
+
+class _LegacyEncoder(json.JSONEncoder):
+    """Replicate the original asdict based encoder."""
+
+    def default(self, o: Any) -> Any:  # noqa: ANN401
+        """Convert dataclass instances to dictionaries."""
+        if dataclasses.is_dataclass(o) and not isinstance(o, type):
+            data = dataclasses.asdict(o)
+            if overrides := getattr(o, SERIALIZATION_OVERRIDES, None):
+                data.update(overrides())
+            return {
+                k: v
+                for k, v in data.items()
+                if v and not self._is_excluded(k, o)
+            }
+        return super().default(o)
+
+    @staticmethod
+    def _is_excluded(field_name: str, instance: object) -> bool:
+        """Check if a field should be excluded from serialization."""
+        for field in dataclasses.fields(instance.__class__):  # type: ignore[arg-type]
+            if field.name == field_name:
+                return field.metadata.get(EXCLUDE_FROM_SERIALIZATION, False)
+        return False
+
+
+def _make_db(count: int) -> list[RomDetail]:
+    """Create a synthetic ROM database."""
+    rng = random.Random(1)
+    db = []
+    for i in range(count):
+        system = rng.choice(SYSTEMS)
+        crc = f"{rng.getrandbits(32):08x}"
+        file_id = i % 4 == 0
+        db.append(
+            RomDetail(
+                name=f"Game {i}",
+                parent=system,
+                item_path=f"{system}/Game {i} (USA).zip",
+                title=f"Game {i} (USA)",
+                source="file_name" if file_id else "No-Intro",
+                id_method=FILE_ID_METHOD if file_id else "db_crc",
+                id=str([crc]) if file_id else crc,
+                region=tuple(rng.choice(REGIONS)),
+                year=str(1985 + i % 30),
+            )
+        )
+    return db
+
+
+def _time(func: Callable[[], list[str]]) -> tuple[list[str], float]:
+    """Run a serializer and return its output and elapsed time."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    """Compare per-row serialization as performed by the ROM store."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=50000)
+    args = parser.parse_args()
+    db = _make_db(args.entries)
+    legacy, legacy_time = _time(
+        lambda: [
+            json.dumps(r, cls=_LegacyEncoder, ensure_ascii=False) for r in db
+        ]
+    )
+    encoder, encoder_time = _time(
+        lambda: [
+            json.dumps(r, cls=EnhancedJSONEncoder, ensure_ascii=False)
+            for r in db
+        ]
+    )
+    direct, direct_time = _time(
+        lambda: [
+            json.dumps(dataclass_to_dict(r), ensure_ascii=False) for r in db
+        ]
+    )
+    if not legacy == encoder == direct:
+        msg = "Serialized output differs from the legacy encoder"
+        raise RuntimeError(msg)
+    print(f"{'method':>10} {'seconds':>9} {'rows/s':>10}")
+    for name, elapsed in (
+        ("legacy", legacy_time),
+        ("encoder", encoder_time),
+        ("direct", direct_time),
+    ):
+        print(f"{name:>10} {elapsed:>9.3f} {len(db) / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
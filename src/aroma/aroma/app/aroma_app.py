@@ -12,7 +12,6 @@ from app.navigation.menu_launch_options import MenuLaunchOptions
 from app.navigation.nav_controller import NavController
 from app.screen_manager import ScreenManager
 from app.strings import Strings
-from manager.rom_manager import RomManager
 from sdl2 import (
     SDL_CONTROLLER_BUTTON_GUIDE,
     SDL_INIT_GAMECONTROLLER,
@@ -58,7 +57,6 @@ class AromaApp(ClassSingleton):  # pylint: disable=too-many-instance-attributes
         """Clean up resources and exits the application."""
         self._logger.info("Stopping application.")
         self.running = False
-        RomManager().cleanup()
         self.controller.cleanup()
         ext_quit()
         SDL_Quit()
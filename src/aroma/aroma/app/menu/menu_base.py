@@ -113,6 +113,7 @@ class MenuBase(ClassSingleton, ABC):  # pylint: disable=too-many-instance-attrib
         *,
         side_pane: SidePane | None = None,
         help_info: list[str] | None = None,
+        function: Callable[[], None] | None = None,
     ) -> MenuItemSingle:
         """TODO."""
         current_val = str(AppConfig().get_value(config_attr))
@@ -120,6 +121,8 @@ class MenuBase(ClassSingleton, ABC):  # pylint: disable=too-many-instance-attrib
         def update_config(value: str) -> None:
             AppConfig().update_value(config_attr, value)
             self.reset_menu()
+            if function and value != current_val:
+                function()
 
         return self._generate_keyboard_menu_item(
             update_config,
@@ -3,11 +3,13 @@
 from collections import OrderedDict
 from pathlib import Path
 
+from app.background_worker import BackgroundWorker
 from app.menu.menu_base import MenuBase
 from app.menu.menu_item_multi import MenuItemMulti
 from app.menu.menu_item_single import MenuItemSingle
 from app.model.side_pane import SidePane
 from app.strings import Strings
+from manager.rom_manager import RomManager
 from shared.app_config import AppConfig
 from shared.constants import (
     CUSTOM_STR,
@@ -65,6 +67,14 @@ class MenuRomNaming(MenuBase):
             ],
             Strings().name_format_prompt,
             help_info=[", ".join(Strings().get_format_mapping())],
+            function=MenuRomNaming._rename_roms,
+        )
+
+    @staticmethod
+    def _rename_roms() -> None:
+        """Regenerate ROM display names using the updated name format."""
+        BackgroundWorker().do_work(
+            RomManager().rename_roms, Strings().renaming_roms
         )
 
     def _build_dynamic_menu(
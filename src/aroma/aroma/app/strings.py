@@ -173,6 +173,7 @@ class Strings(JsonDataClass):  # pylint: disable=too-many-instance-attributes
     scraping_imgs: str = ""
     removing_broken_imgs: str = ""
     refreshing_roms: str = ""
+    renaming_roms: str = ""
     launch_rom: str = ""
     rom: str = ""
     emu: str = ""
@@ -0,0 +1,88 @@
+"""Represents a compact probabilistic set of string values."""
+
+import hashlib
+import math
+import struct
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+BLOOM_MAGIC = b"AROMABF1"
+BLOOM_HEADER = struct.Struct("<8sQIH")
+
+
+@dataclass
+class BloomFilter:
+    """Data class for a bloom filter with no false negatives."""
+
+    bit_count: int
+    hash_count: int
+    bits: bytearray
+
+    @staticmethod
+    def create(count: int, false_positive_rate: float) -> "BloomFilter":
+        """Create an empty filter sized for count values."""
+        count = max(count, 1)
+        bit_count = math.ceil(
+            -count * math.log(false_positive_rate) / math.log(2) ** 2
+        )
+        hash_count = max(1, round(bit_count / count * math.log(2)))
+        return BloomFilter(
+            bit_count, hash_count, bytearray((bit_count + 7) // 8)
+        )
+
+    @staticmethod
+    def from_values(
+        values: Iterable[str], count: int, false_positive_rate: float
+    ) -> "BloomFilter":
+        """Create a filter populated with the provided values."""
+        bloom = BloomFilter.create(count, false_positive_rate)
+        for value in values:
+            bloom.add(value)
+        return bloom
+
+    def _positions(self, value: str) -> Iterator[int]:
+        """Yield the bit positions for a value using double hashing."""
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.bit_count
+
+    def add(self, value: str) -> None:
+        """Add a value to the filter."""
+        for pos in self._positions(value):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value: object) -> bool:
+        """Check if a value may be in the filter."""
+        return isinstance(value, str) and all(
+            self.bits[pos >> 3] & (1 << (pos & 7))
+            for pos in self._positions(value)
+        )
+
+    def save(self, path: Path, tag: str) -> None:
+        """Write the filter to file, labelled with a validation tag."""
+        encoded = tag.encode()
+        header = BLOOM_HEADER.pack(
+            BLOOM_MAGIC, self.bit_count, self.hash_count, len(encoded)
+        )
+        path.write_bytes(header + encoded + self.bits)
+
+    @staticmethod
+    def load(path: Path, tag: str) -> "BloomFilter | None":
+        """Read a filter from file if it exists and matches the tag."""
+        if not path.is_file():
+            return None
+        data = path.read_bytes()
+        if len(data) < BLOOM_HEADER.size:
+            return None
+        magic, bit_count, hash_count, tag_size = BLOOM_HEADER.unpack_from(data)
+        start = BLOOM_HEADER.size + tag_size
+        if (
+            magic != BLOOM_MAGIC
+            or data[BLOOM_HEADER.size : start] != tag.encode()
+            or len(data) - start != (bit_count + 7) // 8
+        ):
+            return None
+        return BloomFilter(bit_count, hash_count, bytearray(data[start:]))
@@ -3,8 +3,10 @@
 import re
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
-from shared.constants import CUSTOM_STR
+from shared.constants import CUSTOM_STR, EMU_EXT_KEY
+from shared.tools import util
 
 
 @dataclass
@@ -47,6 +49,24 @@ class EmuConfig:  # pylint: disable = too-many-instance-attributes
     sampling_rate: int | None = None
     sampling_rate_min: int | None = None
 
+    @staticmethod
+    def from_dict(obj: dict[str, Any], system: Path) -> "EmuConfig":
+        """Create an EmuConfig from a system's emulator config file."""
+        return EmuConfig(
+            system,
+            obj.get("label", ""),
+            obj.get("launch", ""),
+            util.tsp_path(str(obj.get("background", ""))),
+            util.tsp_path(str(obj.get("icon", ""))),
+            [
+                ext.lower()
+                for ext in obj.get(EMU_EXT_KEY, "").split("|")
+                if ext
+            ],
+            [Launchlist.from_dict(y) for y in obj.get("launchlist", [])],
+            obj.get("aroma_cpu_profile"),
+        )
+
     @property
     def format_label(self) -> str:
         """TODO."""
@@ -4,10 +4,14 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from shared.constants import COLLECTION_PATH, ROM_PATH
 from shared.tools.enhanced_json_encoder import EXCLUDE_FROM_SERIALIZATION
 
+if TYPE_CHECKING:
+    from data.model.name_format import NameFormat
+
 
 class LaunchableType(Enum):
     """TODO."""
@@ -16,7 +20,7 @@ class LaunchableType(Enum):
     SHORTCUT = 2
 
 
-@dataclass
+@dataclass(slots=True)
 class LaunchableDetail(ABC):  # pylint: disable=too-many-instance-attributes
     """TODO."""
 
@@ -53,5 +57,5 @@ class LaunchableDetail(ABC):  # pylint: disable=too-many-instance-attributes
         """TODO."""
 
     @abstractmethod
-    def format_name(self) -> str:
+    def format_name(self, name_format: "NameFormat | None" = None) -> str:
         """Generate a formatted string representation of the name."""
@@ -0,0 +1,22 @@
+"""Represents the fingerprint of a scanned ROM file."""
+
+from dataclasses import dataclass, field
+from os import stat_result
+
+
+@dataclass
+class ManifestEntry:
+    """Data class for storing a ROM file's fingerprint and computed CRCs."""
+
+    size: int = 0
+    mtime_ns: int = 0
+    crc: list[str] = field(default_factory=list)
+
+    @staticmethod
+    def from_stat(stat: stat_result, crc: list[str]) -> "ManifestEntry":
+        """Create a ManifestEntry from a file's stat result."""
+        return ManifestEntry(stat.st_size, stat.st_mtime_ns, crc)
+
+    def matches(self, stat: stat_result) -> bool:
+        """Check if the fingerprint matches the provided stat result."""
+        return self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
@@ -1,8 +1,8 @@
 """Module for managing media items."""
 
+from collections.abc import Collection
 from dataclasses import dataclass
 
-from shared.app_config import AppConfig
 from shared.constants import (
     SCRAPER_MAX_HEIGHT,
     SCRAPER_MAX_WIDTH,
@@ -33,14 +33,15 @@ class MediaItem:
 
     @staticmethod
     def from_list(
-        obj: list[dict[str, str]], region_priority: dict[str, int]
+        obj: list[dict[str, str]],
+        region_priority: dict[str, int],
+        types: Collection[str],
     ) -> list["MediaItem"]:
         """Create a list of MediaItems and sort them by region priority."""
         valid_items = [
             mi
             for o in obj
-            if (mi := MediaItem.from_dict(o))
-            and mi.type == AppConfig().scrape_media_type
+            if (mi := MediaItem.from_dict(o)) and mi.type in types
         ]
         if len(valid_items) <= 1:
             return valid_items
@@ -0,0 +1,57 @@
+"""Represents a set of media types scraped into one image folder."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from shared.app_config import AppConfig
+from shared.constants import IMG_PATH, SD_PATH
+
+if TYPE_CHECKING:
+    from data.model.media_item import MediaItem
+    from data.model.rom_detail import RomDetail
+
+
+@dataclass(frozen=True)
+class MediaTarget:
+    """Data class for media types, in priority order, and their folder."""
+
+    types: tuple[str, ...]
+    path: Path
+
+    @staticmethod
+    def from_dict(obj: dict[str, Any]) -> "MediaTarget":
+        """Create a MediaTarget from a scrape_extra_media config entry."""
+        types = obj.get("types", ())
+        return MediaTarget(
+            (types,) if isinstance(types, str) else tuple(types),
+            SD_PATH / str(obj.get("path", "")),
+        )
+
+    @staticmethod
+    def from_config() -> tuple["MediaTarget", ...]:
+        """Return the primary media target followed by any extra targets."""
+        targets = [MediaTarget((AppConfig().scrape_media_type,), IMG_PATH)]
+        for obj in AppConfig().scrape_extra_media:
+            target = MediaTarget.from_dict(obj)
+            if target.types and target.path != SD_PATH:
+                targets.append(target)
+        return tuple(targets)
+
+    @staticmethod
+    def media_types(targets: Iterable["MediaTarget"]) -> set[str]:
+        """Return every media type used by the provided targets."""
+        return {t for target in targets for t in target.types}
+
+    def image_path(self, rom: "RomDetail") -> Path:
+        """Return the path of this target's image for a ROM."""
+        return self.path / rom.parent / rom.get_image_path().name
+
+    def select(self, items: list["MediaItem"]) -> "MediaItem | None":
+        """Return the highest priority item, keeping the region order."""
+        for media_type in self.types:
+            for item in items:
+                if item.type == media_type:
+                    return item
+        return None
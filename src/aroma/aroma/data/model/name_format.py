@@ -0,0 +1,77 @@
+"""Represents a ROM name format compiled into reusable segments."""
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cache
+
+from shared.constants import (
+    NAMING_ADDITIONAL_ID,
+    NAMING_DISC_ID,
+    NAMING_FORMAT_ID,
+    NAMING_HACK_ID,
+    NAMING_NAME_ID,
+    NAMING_REGION_ID,
+    NAMING_TITLE_ID,
+    NAMING_VERSION_ID,
+    NAMING_YEAR_ID,
+)
+
+NAMING_FIELD_IDS = (
+    NAMING_TITLE_ID,
+    NAMING_NAME_ID,
+    NAMING_REGION_ID,
+    NAMING_DISC_ID,
+    NAMING_FORMAT_ID,
+    NAMING_HACK_ID,
+    NAMING_VERSION_ID,
+    NAMING_YEAR_ID,
+    NAMING_ADDITIONAL_ID,
+)
+NAMING_FIELD_PATTERN = re.compile(
+    "|".join(re.escape(i) for i in NAMING_FIELD_IDS)
+)
+NAMING_FIELD_PREFIX = "$"
+EMPTY_BRACKETS = ("[]", "()", "{}")
+
+
+@dataclass(frozen=True)
+class NameFormat:
+    """Data class for a name format compiled into a field pattern."""
+
+    template: str
+    fields: tuple[str, ...]
+    pattern: str | None
+
+    @staticmethod
+    @cache
+    def compile(template: str) -> "NameFormat":
+        """Split a name format into literal segments and field ids."""
+        literals = NAMING_FIELD_PATTERN.split(template)
+        pattern = "{}".join(
+            p.replace("{", "{{").replace("}", "}}") for p in literals
+        )
+        return NameFormat(
+            template,
+            tuple(NAMING_FIELD_PATTERN.findall(template)),
+            None if NAMING_FIELD_PREFIX in "".join(literals) else pattern,
+        )
+
+    def _replace_fields(self, get_value: Callable[[str], str]) -> str:
+        """Replace each field id in turn across the whole name."""
+        result = self.template
+        for k in NAMING_FIELD_IDS:
+            if k in result:
+                result = result.replace(k, get_value(k))
+        return result
+
+    def apply(self, get_value: Callable[[str], str]) -> str:
+        """Format a name from the value of each field id."""
+        result = None
+        if self.pattern is not None:
+            result = self.pattern.format(*[get_value(k) for k in self.fields])
+        if result is None or NAMING_FIELD_PREFIX in result:
+            result = self._replace_fields(get_value)
+        for brackets in EMPTY_BRACKETS:
+            result = result.replace(brackets, "")
+        return " ".join(result.split())
@@ -0,0 +1,29 @@
+"""Represents the details parsed from a ROM filename stem."""
+
+from dataclasses import dataclass
+from typing import Any
+
+from shared.tools.enhanced_json_encoder import dataclass_from_dict
+
+
+@dataclass(slots=True)
+class ParsedName:  # pylint: disable=too-many-instance-attributes
+    """Data class for storing the details parsed from a filename stem."""
+
+    name: str = ""
+    region: tuple[str, ...] = ()
+    disc: tuple[str, ...] = ()
+    format: tuple[str, ...] = ()
+    version: str | None = None
+    year: str | None = None
+    additional: tuple[str, ...] = ()
+
+    @staticmethod
+    def from_dict(obj: dict[str, Any]) -> "ParsedName":
+        """Create a ParsedName from its serialized form."""
+        parsed = dataclass_from_dict(ParsedName, obj)
+        parsed.region = tuple(parsed.region)
+        parsed.disc = tuple(parsed.disc)
+        parsed.format = tuple(parsed.format)
+        parsed.additional = tuple(parsed.additional)
+        return parsed
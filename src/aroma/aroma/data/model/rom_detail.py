@@ -1,12 +1,20 @@
 """Represents detailed information about a ROM file."""
 
+import ast
 import re
+import sys
+from array import array
+from collections.abc import Iterable
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
+from typing import Any
 
 from data.model.launchable_detail import LaunchableDetail, LaunchableType
+from data.model.name_format import NameFormat
 from shared.app_config import AppConfig
 from shared.constants import (
+    FILE_ID_METHOD,
     IMG_PATH,
     NAMING_ADDITIONAL_ID,
     NAMING_DISC_ID,
@@ -18,9 +26,36 @@ from shared.constants import (
     NAMING_VERSION_ID,
     NAMING_YEAR_ID,
 )
+from shared.tools.enhanced_json_encoder import (
+    EXCLUDE_FROM_SERIALIZATION,
+    dataclass_from_dict,
+)
+
+CRC_TYPECODE = "I"
+CRC_PATTERN = re.compile(r"[0-9a-f]{8}")
+CRC_LIST_PATTERN = re.compile(r"\['[0-9a-f]{8}'(?:, '[0-9a-f]{8}')*\]")
+
+_INTERNED_VALUES: dict[tuple[str, ...], tuple[str, ...]] = {}
+_NAME_FIELD_ATTRS = {
+    NAMING_TITLE_ID: "title",
+    NAMING_NAME_ID: "name",
+    NAMING_REGION_ID: "_format_region",
+    NAMING_DISC_ID: "_format_disc",
+    NAMING_FORMAT_ID: "_format_vformat",
+    NAMING_HACK_ID: "hack",
+    NAMING_VERSION_ID: "version",
+    NAMING_YEAR_ID: "year",
+    NAMING_ADDITIONAL_ID: "_format_additional",
+}
+
 
+def _intern_values(values: Iterable[str]) -> tuple[str, ...]:
+    """Return a shared tuple of interned strings."""
+    key = tuple(sys.intern(v) for v in values)
+    return _INTERNED_VALUES.setdefault(key, key)
 
-@dataclass
+
+@dataclass(slots=True)
 class RomDetail(LaunchableDetail):  # pylint: disable=too-many-instance-attributes
     """Data class for storing information about a ROM."""
 
@@ -28,18 +63,84 @@ class RomDetail(LaunchableDetail):  # pylint: disable=too-many-instance-attribut
     source: str
     id_method: str = ""
     id: str = ""
-    region: list[str] = field(default_factory=list)
-    disc: list[str] = field(default_factory=list)
-    format: list[str] = field(default_factory=list)
+    region: tuple[str, ...] = ()
+    disc: tuple[str, ...] = ()
+    format: tuple[str, ...] = ()
     hack: str | None = None
     version: str | None = None
     year: str | None = None
-    additional: list[str] = field(default_factory=list)
+    additional: tuple[str, ...] = ()
+    crc: "array[int]" = field(
+        default_factory=partial(array, CRC_TYPECODE),
+        metadata={EXCLUDE_FROM_SERIALIZATION: True},
+    )
 
     def __post_init__(self) -> None:
-        """TODO."""
+        """Intern shared values and pack CRC ids into a typed array."""
         self.item_type = LaunchableType.ROM
-        super().__post_init__()
+        LaunchableDetail.__post_init__(self)
+        self.parent = sys.intern(self.parent)
+        self.source = sys.intern(self.source)
+        self.id_method = sys.intern(self.id_method)
+        self.region = _intern_values(self.region)
+        self.disc = _intern_values(self.disc)
+        self.format = _intern_values(self.format)
+        self.additional = _intern_values(self.additional)
+        self._pack_id()
+
+    @staticmethod
+    def from_dict(obj: dict[str, Any]) -> "RomDetail":
+        """Create a RomDetail from its serialized form."""
+        return dataclass_from_dict(RomDetail, obj)
+
+    def _pack_id(self) -> None:
+        """Move a CRC based id into the typed crc array."""
+        if self.id_method == FILE_ID_METHOD:
+            if not CRC_LIST_PATTERN.fullmatch(self.id):
+                return
+            crc = CRC_PATTERN.findall(self.id)
+        elif CRC_PATTERN.fullmatch(self.id):
+            crc = [self.id]
+        else:
+            return
+        self.crc = array(CRC_TYPECODE, [int(c, 16) for c in crc])
+        self.id = ""
+
+    @staticmethod
+    def crc_array(crc: Iterable[str]) -> "array[int] | None":
+        """Convert CRC strings to a typed array, or None if not all CRCs."""
+        values = list(crc)
+        if not all(CRC_PATTERN.fullmatch(c) for c in values):
+            return None
+        return array(CRC_TYPECODE, [int(c, 16) for c in values])
+
+    @property
+    def ids(self) -> list[str]:
+        """Return the identifiers used to match the ROM."""
+        if self.crc:
+            return [f"{c:08x}" for c in self.crc]
+        if self.id_method == FILE_ID_METHOD and self.id:
+            return list(ast.literal_eval(self.id))
+        return [self.id] if self.id else []
+
+    @property
+    def full_id(self) -> str:
+        """Return the id in its serialized string form."""
+        if not self.crc:
+            return self.id
+        if self.id_method == FILE_ID_METHOD:
+            return str(self.ids)
+        return f"{self.crc[0]:08x}"
+
+    def has_ids(self, ids: list[str]) -> bool:
+        """Check if the ROM was matched using the provided identifiers."""
+        if self.crc:
+            return self.crc == self.crc_array(ids)
+        return self.id == str(ids)
+
+    def serialization_overrides(self) -> dict[str, Any]:
+        """Return serialized values that differ from the stored fields."""
+        return {"id": self.full_id}
 
     @property
     def name_clean(self) -> str:
@@ -47,27 +148,16 @@ class RomDetail(LaunchableDetail):  # pylint: disable=too-many-instance-attribut
         name_clean = re.sub(r"[^a-zA-Z0-9\s]", " ", self.name)
         return re.sub(r"\s+", " ", name_clean)
 
-    def format_name(self, format_string: str | None = None) -> str:
+    def format_name(self, name_format: NameFormat | None = None) -> str:
         """Generate a formatted string representation of the ROM name."""
-        formats = {
-            NAMING_TITLE_ID: self.title,
-            NAMING_NAME_ID: self.name,
-            NAMING_REGION_ID: self._format_region,
-            NAMING_DISC_ID: self._format_disc,
-            NAMING_FORMAT_ID: self._format_vformat,
-            NAMING_HACK_ID: self.hack if self.hack else "",
-            NAMING_VERSION_ID: self.version if self.version else "",
-            NAMING_YEAR_ID: self.year if self.year else "",
-            NAMING_ADDITIONAL_ID: self._format_additional,
-        }
-        result = format_string if format_string else AppConfig().name_format
-        for k, v in formats.items():
-            result = result.replace(k, v)
-        empty_parens = ["[]", "()", r"{}"]
-        for s in empty_parens:
-            result = result.replace(s, "")
-        result = re.sub(r"\s+", " ", result)
-        return result.strip()
+        if name_format is None:
+            name_format = NameFormat.compile(AppConfig().name_format)
+        return name_format.apply(self._name_field)
+
+    def _name_field(self, field_id: str) -> str:
+        """Return the display value of a name format field."""
+        value: str | None = getattr(self, _NAME_FIELD_ATTRS[field_id])
+        return value or ""
 
     @property
     def _format_disc(self) -> str:
@@ -0,0 +1,79 @@
+"""Represents the thread and request allowance of a ScreenScraper account."""
+
+from dataclasses import dataclass
+from typing import Any
+
+from shared.constants import (
+    SCRAPER_DEFAULT_REQUESTS_PER_MINUTE,
+    SCRAPER_DEFAULT_THREADS,
+)
+from shared.tools.enhanced_json_encoder import dataclass_from_dict
+
+SSUSER_FIELDS = {
+    "max_threads": "maxthreads",
+    "max_requests_per_minute": "maxrequestspermin",
+    "requests_today": "requeststoday",
+    "max_requests_per_day": "maxrequestsperday",
+    "ko_today": "requestskotoday",
+    "max_ko_per_day": "maxrequestskoperday",
+}
+
+
+@dataclass
+class ScraperQuota:  # pylint: disable=too-many-instance-attributes
+    """Data class for the daily allowance of a ScreenScraper account."""
+
+    datestamp: int = 0
+    max_threads: int = SCRAPER_DEFAULT_THREADS
+    max_requests_per_minute: int = SCRAPER_DEFAULT_REQUESTS_PER_MINUTE
+    requests_today: int = 0
+    max_requests_per_day: int = 0
+    ko_today: int = 0
+    max_ko_per_day: int = 0
+
+    @staticmethod
+    def from_dict(obj: dict[str, Any]) -> "ScraperQuota":
+        """Create a ScraperQuota from its serialized form."""
+        return dataclass_from_dict(ScraperQuota, obj)
+
+    @staticmethod
+    def from_ssuser(obj: dict[str, Any], datestamp: int) -> "ScraperQuota":
+        """Create a ScraperQuota from a ScreenScraper ssuser response."""
+        quota = ScraperQuota(datestamp)
+        for attr, key in SSUSER_FIELDS.items():
+            try:
+                value = int(obj[key])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if value > 0 or attr in {"requests_today", "ko_today"}:
+                setattr(quota, attr, value)
+        return quota
+
+    @property
+    def remaining(self) -> int | None:
+        """Return the requests left today, or None if there is no limit."""
+        left = [
+            max(limit - used, 0)
+            for limit, used in (
+                (self.max_requests_per_day, self.requests_today),
+                (self.max_ko_per_day, self.ko_today),
+            )
+            if limit > 0
+        ]
+        return min(left) if left else None
+
+    def is_low(self, reserve: float) -> bool:
+        """Check if less than the reserve share of a daily limit is left."""
+        return any(
+            limit - used < limit * reserve
+            for limit, used in (
+                (self.max_requests_per_day, self.requests_today),
+                (self.max_ko_per_day, self.ko_today),
+            )
+            if limit > 0
+        )
+
+    def exhaust(self) -> None:
+        """Mark the daily allowance as used up."""
+        self.max_requests_per_day = max(self.max_requests_per_day, 1)
+        self.requests_today = self.max_requests_per_day
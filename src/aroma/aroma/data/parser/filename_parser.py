@@ -1,12 +1,18 @@
 """Parses filenames to extract ROM details."""
 
 import re
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
+from data.model.parsed_name import ParsedName
 from data.model.rom_detail import RomDetail
 from shared.classes.class_singleton import ClassSingleton
 from shared.constants import (
+    APP_PARSE_CACHE_PATH,
     FILE_ID_METHOD,
     NAMING_DISC_PATTERN,
     NAMING_EXCLUDE_SYSTEMS,
@@ -16,6 +22,7 @@ from shared.constants import (
     NAMING_SEARCH_PATTERN,
     NAMING_VERSION_PATTERN,
     NAMING_YEAR_PATTERN,
+    PARSE_CACHE_SIZE,
 )
 from shared.tools import util
 
@@ -24,10 +31,39 @@ REPLACE_STRINGS = {
     "Hong Kong": "Hong|Kong",
     "United Kingdom": "United|Kingdom",
 }
+REPLACE_LOOKUP = {k.lower(): v for k, v in REPLACE_STRINGS.items()}
+REPLACE_PATTERN = re.compile(
+    "|".join(re.escape(k) for k in REPLACE_STRINGS), re.IGNORECASE
+)
+SPLIT_PATTERN = re.compile(r"[,\-\s]+")
+ADDITIONAL_SPLIT_PATTERN = re.compile(r"[,\s]")
+ADDITIONAL_DATE_PATTERN = re.compile(r"(?<!\d)-\d{2}(?!\d)(?:-\d{2})?")
+ADDITIONAL_DASH_PATTERN = re.compile(r"-+")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+TOKEN_PATTERN = re.compile(
+    "|".join(
+        f"(?P<{kind}>{pattern.pattern})"
+        for kind, pattern in (
+            ("disc", NAMING_DISC_PATTERN),
+            ("format", NAMING_FORMAT_PATTERN),
+            ("year", NAMING_YEAR_PATTERN),
+            ("version", NAMING_VERSION_PATTERN),
+        )
+    ),
+    re.IGNORECASE,
+)
 
 YEAR_RANGE = (1970, 2024)
 UNKNOWN_YEAR_TEXT = "x"
 IGNORE_ADDITIONAL = ["of"]
+GROUP_CACHE_SIZE = 4096
+PARSER_VERSION = 1
+
+
+@lru_cache(maxsize=1024)
+def _item_pattern(item: str) -> re.Pattern[str]:
+    """Compile a case insensitive pattern matching the literal item."""
+    return re.compile(re.escape(item), re.IGNORECASE)
 
 
 class FilenameParser(ClassSingleton):
@@ -45,98 +81,116 @@ class FilenameParser(ClassSingleton):
         version: str | None = None
         additional: set[str] = field(default_factory=set)
 
+    @dataclass(frozen=True)
+    class _GroupTokens:
+        """Holds the ordered tokens extracted from a bracketed group."""
+
+        region: tuple[str, ...] = ()
+        disc: tuple[str, ...] = ()
+        vf: tuple[str, ...] = ()
+        year: str | None = None
+        version: str | None = None
+        additional: str | None = None
+
     def __init__(self) -> None:
         super().__init__()
-        self._region_map = util.load_simple_json(NAMING_REGION_RESOURCE)
-        self._region_set = set(self._region_map.keys())
+        self._region_map: dict[str, tuple[str, ...]] = {
+            k: tuple(v.split("|"))
+            for k, v in util.load_simple_json(NAMING_REGION_RESOURCE).items()
+        }
+        self._groups: dict[
+            tuple[str, bool, bool], FilenameParser._GroupTokens
+        ] = {}
+        self._parsed: OrderedDict[str, ParsedName] = OrderedDict()
+        self._loaded = False
+        self._dirty = False
 
     @staticmethod
     def _replace_strings(value: str) -> str:
         """Replace all occurrences of keys in REPLACE_STRINGS."""
-        for old, new in REPLACE_STRINGS.items():
-            value = re.sub(old, new, value, flags=re.IGNORECASE)
-        return value
+        return REPLACE_PATTERN.sub(
+            lambda m: REPLACE_LOOKUP[m.group(0).lower()], value
+        )
 
     @staticmethod
     def _split_and_normalise(value: str) -> list[str]:
         """Split a string by commas, hyphens, and spaces."""
-        items = re.split(r"[,\-\s]+", value)
-        return [item.strip() for item in items if item.strip()]
+        return [
+            item for i in SPLIT_PATTERN.split(value) if (item := i.strip())
+        ]
 
     @staticmethod
     def _strip_item_from_text(text: str, item: str) -> str:
         """Remove an item from the text."""
-        return re.sub(re.escape(item), "", text, flags=re.IGNORECASE).strip()
+        return _item_pattern(item).sub("", text).strip()
 
-    def _check_regions(self, result: "_ParserResult") -> None:
-        """Check if provided items exist in the region map."""
-        items = self._split_and_normalise(result.content)
+    def _check_regions(self, content: str) -> tuple[str, tuple[str, ...]]:
+        """Extract regions found in the region lookup table."""
         matched: list[str] = []
-        for item in items:
-            if item in self._region_map:
-                matched.extend(self._region_map[item].split("|"))
-                self._logger.debug("Matched region: %s", item)
-                result.content = self._strip_item_from_text(
-                    result.content, item
-                )
-        result.region.update(matched)
+        for item in self._split_and_normalise(content):
+            if (regions := self._region_map.get(item)) is not None:
+                matched.extend(regions)
+                content = self._strip_item_from_text(content, item)
+        return content, tuple(matched)
 
     @staticmethod
-    def _check_disc(result: "_ParserResult") -> None:
+    def _check_disc(content: str) -> tuple[str, tuple[str, ...]]:
         """Extract disc information from the text."""
-        matched = NAMING_DISC_PATTERN.findall(result.content)
-        result.disc.update([f"{m[0]} {m[1]}".upper() for m in matched])
-        result.content = NAMING_DISC_PATTERN.sub("", result.content).strip()
+        if not (matched := NAMING_DISC_PATTERN.findall(content)):
+            return content.strip(), ()
+        disc = tuple(f"{m[0]} {m[1]}".upper() for m in matched)
+        return NAMING_DISC_PATTERN.sub("", content).strip(), disc
 
     @staticmethod
-    def _check_format(result: "_ParserResult") -> None:
+    def _check_format(content: str) -> tuple[str, tuple[str, ...]]:
         """Extract format information from the text."""
-        matched = NAMING_FORMAT_PATTERN.findall(result.content)
-        result.vf.update([term.upper() for term in matched])
-        result.content = NAMING_FORMAT_PATTERN.sub("", result.content).strip()
+        if not (matched := NAMING_FORMAT_PATTERN.findall(content)):
+            return content.strip(), ()
+        vf = tuple(term.upper() for term in matched)
+        return NAMING_FORMAT_PATTERN.sub("", content).strip(), vf
+
+    @staticmethod
+    def _is_year(value: str) -> bool:
+        """Check if a year candidate is unknown or within the year range."""
+        return value[-1].lower() == UNKNOWN_YEAR_TEXT or (
+            value.isdigit() and YEAR_RANGE[0] < int(value) < YEAR_RANGE[1]
+        )
 
     @staticmethod
-    def _check_year(result: "_ParserResult") -> None:
+    def _check_year(content: str) -> tuple[str, str | None]:
         """Extract year information from the text."""
-        matched: list[str] = NAMING_YEAR_PATTERN.findall(result.content)
-        for m in matched:
-            valid_year = m[-1].lower() == UNKNOWN_YEAR_TEXT or (
-                m.isdigit() and YEAR_RANGE[0] < int(m) < YEAR_RANGE[1]
-            )
-            if not valid_year:
-                continue
-            result.year = m.upper()
-            result.content = FilenameParser._strip_item_from_text(
-                result.content, m
-            )
-            break
+        for m in NAMING_YEAR_PATTERN.findall(content):
+            if FilenameParser._is_year(m):
+                return (
+                    FilenameParser._strip_item_from_text(content, m),
+                    m.upper(),
+                )
+        return content, None
 
     @staticmethod
-    def _check_version(result: "_ParserResult") -> None:
+    def _check_version(content: str) -> tuple[str, str | None]:
         """Extract version information from the text."""
-        if match := NAMING_VERSION_PATTERN.search(result.content):
-            result.version = match.group(0).lower()
-            result.content = FilenameParser._strip_item_from_text(
-                result.content, match.group(0)
+        if match := NAMING_VERSION_PATTERN.search(content):
+            return (
+                FilenameParser._strip_item_from_text(content, match.group(0)),
+                match.group(0).lower(),
             )
+        return content, None
 
     @staticmethod
-    def _get_additional(result: "_ParserResult") -> None:
+    def _get_additional(content: str) -> str | None:
         """Extract any additional information that remains."""
-        if any(
-            word.lower() in result.content.lower()
-            for word in IGNORE_ADDITIONAL
-        ):
-            return
+        lower = content.lower()
+        if any(word.lower() in lower for word in IGNORE_ADDITIONAL):
+            return None
         temp_list: list[str] = []
-        for item in re.split(r"[,\s]", result.content):
-            clean: str = re.sub(r"(?<!\d)-\d{2}(?!\d)(?:-\d{2})?", "", item)
-            clean = re.sub(r"-+", "", clean)
-            clean = re.sub(r"\s+", " ", clean).strip()
+        for item in ADDITIONAL_SPLIT_PATTERN.split(content):
+            clean = ADDITIONAL_DATE_PATTERN.sub("", item)
+            clean = ADDITIONAL_DASH_PATTERN.sub("", clean)
+            clean = WHITESPACE_PATTERN.sub(" ", clean).strip()
             if len(clean) > 1:
                 temp_list.append(clean)
-        if temp_list:
-            result.additional.add(" ".join(temp_list))
+        return " ".join(temp_list) if temp_list else None
 
     @staticmethod
     def _clean_name(text: str) -> str:
@@ -144,16 +198,105 @@ class FilenameParser(ClassSingleton):
         clean = util.remove_loop(text, NAMING_REMOVE_PATTERN)
         return " ".join(clean.split())
 
+    def _scan_group(
+        self,
+        content: str,
+        region: tuple[str, ...],
+        *,
+        find_year: bool,
+        find_version: bool,
+    ) -> "FilenameParser._GroupTokens | None":
+        """Extract the tokens of a group in one pass of the token pattern.
+
+        Returns None if a token overlaps or repeats another, as only the
+        ordered passes resolve those as before.
+        """
+        disc: list[str] = []
+        vf: list[str] = []
+        year = version = None
+        kept: list[str] = []
+        last = 0
+        for match in TOKEN_PATTERN.finditer(content):
+            kind, text = match.lastgroup, match.group()
+            if (
+                kind == "version"
+                and find_year
+                and NAMING_YEAR_PATTERN.search(text)
+            ):
+                return None
+            if kind == "disc":
+                disc.append(text.replace("-", " ").upper())
+            elif kind == "format":
+                vf.append(text.upper())
+            elif (
+                kind == "year"
+                and find_year
+                and not year
+                and self._is_year(text)
+            ):
+                year = text.upper()
+            elif kind == "version" and find_version and not version:
+                version = text.lower()
+            else:
+                continue
+            kept.append(content[last : match.start()])
+            last = match.end()
+        lower = content.lower()
+        if any(lower.count(t.lower()) > 1 for t in (year, version) if t):
+            return None
+        kept.append(content[last:])
+        return self._GroupTokens(
+            region,
+            tuple(disc),
+            tuple(vf),
+            year,
+            version,
+            self._get_additional("".join(kept)),
+        )
+
+    def _tokenize_group(
+        self, content: str, *, find_year: bool, find_version: bool
+    ) -> "FilenameParser._GroupTokens":
+        """Extract the tokens of a bracketed group, reusing earlier scans."""
+        key = (content, find_year, find_version)
+        if (tokens := self._groups.get(key)) is not None:
+            return tokens
+        content, region = self._check_regions(content)
+        tokens = self._scan_group(
+            content, region, find_year=find_year, find_version=find_version
+        )
+        if tokens is None:
+            content, disc = self._check_disc(content)
+            content, vf = self._check_format(content)
+            year = version = None
+            if find_year:
+                content, year = self._check_year(content)
+            if find_version:
+                content, version = self._check_version(content)
+            tokens = self._GroupTokens(
+                region, disc, vf, year, version, self._get_additional(content)
+            )
+        if len(self._groups) >= GROUP_CACHE_SIZE:
+            self._groups.clear()
+        self._groups[key] = tokens
+        return tokens
+
     def _process_content(self, result: "_ParserResult") -> None:
         """Process content to extract ROM details."""
-        self._check_regions(result)
-        self._check_disc(result)
-        self._check_format(result)
-        if not result.year:
-            self._check_year(result)
-        if not result.version:
-            self._check_version(result)
-        self._get_additional(result)
+        tokens = self._tokenize_group(
+            result.content,
+            find_year=not result.year,
+            find_version=not result.version,
+        )
+        result.region.update(tokens.region)
+        result.disc.update(tokens.disc)
+        result.vf.update(tokens.vf)
+        if tokens.year:
+            result.year = tokens.year
+        if tokens.version:
+            result.version = tokens.version
+        if tokens.additional:
+            result.additional.add(tokens.additional)
 
     @staticmethod
     def _get_id_method(system: str, crc: list[str] | None) -> str:
@@ -162,27 +305,107 @@ class FilenameParser(ClassSingleton):
             return ""
         return FILE_ID_METHOD
 
-    def parse(self, path: Path, crc: list[str] | None = None) -> RomDetail:
-        """Parse the filename to extract ROM details."""
-        stem = self._replace_strings(path.stem)
-        self._logger.debug("Parsing filename: %s", stem)
+    def _get_version(self) -> str:
+        """Return the version tag that cached parse results must match."""
+        if not NAMING_REGION_RESOURCE.is_file():
+            return str(PARSER_VERSION)
+        return f"{PARSER_VERSION}:{util.check_crc(NAMING_REGION_RESOURCE)}"
+
+    def _load(self) -> None:
+        """Load the parse cache from file if not already loaded."""
+        if self._loaded:
+            return
+        self._loaded = True
+        self._logger.info("Loading parse cache from %s.", APP_PARSE_CACHE_PATH)
+        data = util.load_simple_json(APP_PARSE_CACHE_PATH)
+        if data.get("version") != self._get_version():
+            self._logger.info("Parse cache is missing or outdated.")
+            return
+        entries: dict[str, dict[str, Any]] = data.get("entries", {})
+        for stem, obj in list(entries.items())[-PARSE_CACHE_SIZE:]:
+            self._parsed[stem] = ParsedName.from_dict(obj)
+        self._logger.info("Loaded %d parsed filenames.", len(self._parsed))
+
+    def save(self) -> None:
+        """Save newly parsed filenames to the parse cache."""
+        if not self._dirty:
+            return
+        self._logger.info(
+            "Saving %d parsed filenames to %s.",
+            len(self._parsed),
+            APP_PARSE_CACHE_PATH,
+        )
+        util.save_simple_json(
+            {"version": self._get_version(), "entries": self._parsed},
+            APP_PARSE_CACHE_PATH,
+        )
+        self._dirty = False
+
+    def _parse_stem(self, stem: str) -> ParsedName:
+        """Extract the details of a filename stem."""
+        replaced = self._replace_strings(stem)
+        self._logger.debug("Parsing filename: %s", replaced)
         result = self._ParserResult()
-        for content in NAMING_SEARCH_PATTERN.findall(stem):
+        for content in NAMING_SEARCH_PATTERN.findall(replaced):
             result.content = content
             self._process_content(result)
-        self._logger.debug("Parsed ROM details: title=%s", path.stem)
+        self._logger.debug("Parsed ROM details: title=%s", stem)
+        return ParsedName(
+            name=self._clean_name(stem),
+            region=tuple(result.region),
+            disc=tuple(result.disc),
+            format=tuple(result.vf),
+            version=result.version,
+            year=result.year,
+            additional=tuple(result.additional),
+        )
+
+    def _get_parsed(self, stem: str) -> ParsedName:
+        """Return the cached details of a stem, parsing it if required."""
+        self._load()
+        if (parsed := self._parsed.get(stem)) is not None:
+            self._parsed.move_to_end(stem)
+            return parsed
+        parsed = self._parsed[stem] = self._parse_stem(stem)
+        if len(self._parsed) > PARSE_CACHE_SIZE:
+            self._parsed.popitem(last=False)
+        self._dirty = True
+        return parsed
+
+    def parse(self, path: Path, crc: list[str] | None = None) -> RomDetail:
+        """Parse the filename to extract ROM details."""
+        parsed = self._get_parsed(path.stem)
         return RomDetail(
             title=path.stem,
             parent=path.parts[0],
             item_path=str(path),
-            name=self._clean_name(path.stem),
+            name=parsed.name,
             source="file_name",
             id_method=self._get_id_method(path.parts[0], crc),
             id=str(crc) if crc else "",
-            region=list(result.region),
-            disc=list(result.disc),
-            format=list(result.vf),
-            version=result.version,
-            year=result.year,
-            additional=list(result.additional),
+            region=parsed.region,
+            disc=parsed.disc,
+            format=parsed.format,
+            version=parsed.version,
+            year=parsed.year,
+            additional=parsed.additional,
+        )
+
+    def parse_many(
+        self,
+        paths: Iterable[Path],
+        crcs: Mapping[Path, list[str] | None] | None = None,
+    ) -> dict[Path, RomDetail]:
+        """Parse multiple filenames, then save any newly parsed stems."""
+        self._load()
+        paths = list(paths)
+        crcs = crcs or {}
+        cached = sum(p.stem in self._parsed for p in paths)
+        result = {p: self.parse(p, crcs.get(p)) for p in paths}
+        self._logger.info(
+            "Parsed %d filenames, %d from the parse cache.",
+            len(paths),
+            cached,
         )
+        self.save()
+        return result
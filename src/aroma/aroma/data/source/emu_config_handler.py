@@ -2,10 +2,9 @@
 
 import re
 
-from data.model.emu_config import EmuConfig, Launchlist
+from data.model.emu_config import EmuConfig
 from shared.classes.class_singleton import ClassSingleton
 from shared.constants import (
-    EMU_EXT_KEY,
     EMU_PATH,
     INVALID_SYSTEM_PREFIX,
     NON_CONFIGURABLE_SYSTEMS,
@@ -82,20 +81,7 @@ class EmuConfigHandler(ClassSingleton):
     def _get_system(system: str) -> "EmuConfig":
         """TODO."""
         config = util.load_simple_json(EMU_PATH / system / "config.json")
-        emu_config = EmuConfig(
-            EMU_PATH / system,
-            config.get("label", ""),
-            config.get("launch", ""),
-            util.tsp_path(str(config.get("background", ""))),
-            util.tsp_path(str(config.get("icon", ""))),
-            [
-                ext.lower()
-                for ext in config.get(EMU_EXT_KEY, "").split("|")
-                if ext
-            ],
-            [Launchlist.from_dict(y) for y in config.get("launchlist", [])],
-            config.get("aroma_cpu_profile", None),
-        )
+        emu_config = EmuConfig.from_dict(config, EMU_PATH / system)
         return EmuConfigHandler._get_cpufreq(emu_config, system)
 
     @staticmethod
@@ -1,11 +1,17 @@
 """Handles ROM name queries from databases."""
 
+import json
+import re
+from contextlib import closing, suppress
 from dataclasses import dataclass, field
+from difflib import SequenceMatcher
 from pathlib import Path
 from typing import Self
 
 import apsw
+from data.model.bloom_filter import BloomFilter
 from data.model.rom_detail import RomDetail
+from shared.app_config import AppConfig
 from shared.classes.class_singleton import ClassSingleton
 from shared.constants import (
     ARCADE_ID_METHOD,
@@ -13,6 +19,10 @@ from shared.constants import (
     CONSOLE_ID_METHOD,
     CONSOLE_NAMES_DB,
     NAMES_APP_RESOURCE,
+    NAMES_DB_FILTER_EXT,
+    NAMES_DB_INDEX_EXT,
+    NAMES_DB_STAMP_EXT,
+    TITLE_ID_METHOD,
 )
 from shared.tools import util
 
@@ -21,37 +31,99 @@ DB_ID_METHOD = {
     CONSOLE_NAMES_DB: CONSOLE_ID_METHOD,
 }
 
-ROM_QUERY = """
-        SELECT id, title, name, source, val, hack, version, year
-        FROM rom
-        WHERE val IN (%s)
+COUNT_VALS = "SELECT COUNT(*) FROM rom WHERE val IS NOT NULL"
+SELECT_VALS = "SELECT val FROM rom WHERE val IS NOT NULL"
+SELECT_TITLES = "SELECT title, name, val FROM rom WHERE val IS NOT NULL"
+CREATE_TITLE_INDEX = """
+        CREATE VIRTUAL TABLE title_index USING fts5 (
+            key, val UNINDEXED, tokenize = 'trigram'
+        );
+        CREATE TABLE title_index_tag (tag TEXT NOT NULL);
     """
-SUBTABLE_QUERY = """
-        SELECT rom_id, name
-        FROM %s
-        WHERE rom_id IN (%s)
+SELECT_TITLE_INDEX_TAG = "SELECT tag FROM title_index_tag"
+INSERT_TITLE_INDEX_TAG = "INSERT INTO title_index_tag (tag) VALUES (?)"
+INSERT_TITLE = "INSERT INTO title_index (key, val) VALUES (?, ?)"
+MATCH_TITLE = """
+        SELECT key, val
+        FROM title_index
+        WHERE title_index MATCH ?
+        ORDER BY rank
+        LIMIT 10
+    """
+TITLE_KEY_PATTERN = re.compile(r"[\W_]+")
+TITLE_NUMBER_PATTERN = re.compile(r"\d+")
+TITLE_KEY_MIN_LENGTH = 3
+TITLE_MATCH_MIN_RATIO = 0.9
+TITLE_INDEX_VERSION = 2
+CREATE_QUERY_TABLE = """
+        CREATE TEMP TABLE IF NOT EXISTS query_val (val TEXT PRIMARY KEY);
+        DELETE FROM query_val;
+    """
+INSERT_QUERY_VAL = "INSERT OR IGNORE INTO query_val (val) VALUES (?)"
+ROM_QUERY = """
+        WITH matched AS MATERIALIZED (
+            SELECT r.id, r.title, r.name, r.source, r.val, r.hack, r.version,
+                r.year
+            FROM query_val AS q
+            JOIN rom AS r ON r.val = q.val
+        ),
+        region_names AS (
+            SELECT rom_id, json_group_array(name) AS names
+            FROM (
+                SELECT rom_id, name
+                FROM region
+                WHERE rom_id IN (SELECT id FROM matched)
+                ORDER BY rom_id, rowid
+            )
+            GROUP BY rom_id
+        ),
+        disc_names AS (
+            SELECT rom_id, json_group_array(name) AS names
+            FROM (
+                SELECT rom_id, name
+                FROM disc
+                WHERE rom_id IN (SELECT id FROM matched)
+                ORDER BY rom_id, rowid
+            )
+            GROUP BY rom_id
+        ),
+        format_names AS (
+            SELECT rom_id, json_group_array(name) AS names
+            FROM (
+                SELECT rom_id, name
+                FROM format
+                WHERE rom_id IN (SELECT id FROM matched)
+                ORDER BY rom_id, rowid
+            )
+            GROUP BY rom_id
+        ),
+        additional_names AS (
+            SELECT rom_id, json_group_array(name) AS names
+            FROM (
+                SELECT rom_id, name
+                FROM additional
+                WHERE rom_id IN (SELECT id FROM matched)
+                ORDER BY rom_id, rowid
+            )
+            GROUP BY rom_id
+        )
+        SELECT m.id, m.title, m.name, m.source, m.val, m.hack, m.version,
+            m.year, r.names, d.names, f.names, a.names
+        FROM matched AS m
+        LEFT JOIN region_names AS r ON r.rom_id = m.id
+        LEFT JOIN disc_names AS d ON d.rom_id = m.id
+        LEFT JOIN format_names AS f ON f.rom_id = m.id
+        LEFT JOIN additional_names AS a ON a.rom_id = m.id
+        ORDER BY m.id
     """
-
-
-@dataclass
-class _DBResult:
-    """Represents a result row from the database."""
-
-    @classmethod
-    def factory(
-        cls,
-        row: tuple["apsw.SQLiteValue", ...],
-    ) -> Self:
-        """Create a DBResult instance from a database row."""
-        return cls(*row)
 
 
 class NameDB(ClassSingleton):
     """A singleton class to handle ROM name queries from databases."""
 
     @dataclass
-    class _RomResult(_DBResult):  # pylint: disable=too-many-instance-attributes
-        """Represents a result from the ROM table in the database."""
+    class _RomResult:  # pylint: disable=too-many-instance-attributes
+        """Represents a ROM row joined with its subtable names."""
 
         row_id: int
         title: str
@@ -61,24 +133,44 @@ class NameDB(ClassSingleton):
         hack: str | None
         version: str | None
         year: str | None
+        region: tuple[str, ...]
+        disc: tuple[str, ...]
+        format: tuple[str, ...]
+        additional: tuple[str, ...]
 
-    @dataclass
-    class _SubtableResult(_DBResult):
-        """Represents a result from subtables."""
+        @classmethod
+        def factory(cls, row: tuple["apsw.SQLiteValue", ...]) -> Self:
+            """Create a RomResult from a joined database row."""
+            names = (tuple(json.loads(v)) if v else () for v in row[8:])
+            return cls(*row[:8], *names)  # type: ignore[arg-type]
 
-        row_id: int
-        name: str
+        def to_detail(
+            self, path: str, id_method: str, rom_id: str
+        ) -> RomDetail:
+            """Create the RomDetail for a matched path."""
+            return RomDetail(
+                title=self.title,
+                parent=Path(path).parts[0],
+                item_path=path,
+                name=self.name,
+                source=self.source,
+                id=rom_id,
+                id_method=id_method,
+                year=self.year,
+                version=self.version,
+                hack=self.hack,
+                region=self.region,
+                disc=self.disc,
+                format=self.format,
+                additional=self.additional,
+            )
 
     @dataclass
-    class _QueryResult:  # pylint: disable=too-many-instance-attributes
+    class _QueryResult:
         """Holds the results of a query."""
 
         query: dict[str, list[str]] = field(default_factory=dict)
-        roms: list["NameDB._RomResult"] = field(default_factory=list)
-        region: dict[int, list[str]] = field(default_factory=dict)
-        disc: dict[int, list[str]] = field(default_factory=dict)
-        format: dict[int, list[str]] = field(default_factory=dict)
-        additional: dict[int, list[str]] = field(default_factory=dict)
+        roms: dict[str, "NameDB._RomResult"] = field(default_factory=dict)
         black_list: set[str] = field(default_factory=set)
         processed: dict[str, RomDetail] = field(default_factory=dict)
 
@@ -87,81 +179,187 @@ class NameDB(ClassSingleton):
             """Extract unique search terms from the query dictionary."""
             return {val for vals in self.query.values() for val in vals}
 
-        @property
-        def row_ids(self) -> list[int]:
-            """Extract ROM IDs from the fetched ROM details."""
-            return [rom.row_id for rom in self.roms]
-
-        @property
-        def rom_vals(self) -> list[str]:
-            """Extract ROM values from the fetched ROM details."""
-            return [rom.rom_id for rom in self.roms]
-
     @staticmethod
     def _get_db(db: Path) -> None:
-        """Ensure the database file exists by extracting it from a resource."""
-        if db.is_file():
-            NameDB.get_static_logger().debug("Database file exists: %s", db)
+        """Ensure the extracted database matches its names.zip member."""
+        if (
+            member := util.get_zip_member(NAMES_APP_RESOURCE, db.name)
+        ) is None:
+            NameDB.get_static_logger().warning(
+                "Unable to validate database file: %s", db
+            )
+            return
+        stamp = db.with_suffix(NAMES_DB_STAMP_EXT)
+        crc = f"{member.CRC:08x}"
+        if (
+            db.is_file()
+            and db.stat().st_size == member.file_size
+            and stamp.is_file()
+            and stamp.read_text(encoding="utf8") == crc
+        ):
+            NameDB.get_static_logger().debug("Database file is valid: %s", db)
             return
         NameDB.get_static_logger().info(
             "Extracting database file: %s", db.name
         )
+        stamp.unlink(missing_ok=True)
         util.extract_from_zip(NAMES_APP_RESOURCE, db.name, db)
+        stamp.write_text(crc, encoding="utf8")
 
     @staticmethod
-    def remove_db() -> None:
-        """Remove the database files for arcade and console ROMs."""
-        for db in (ARCADE_NAMES_DB, CONSOLE_NAMES_DB):
-            if db.is_file():
-                NameDB.get_static_logger().info(
-                    "Removing database file: %s", db
-                )
-                db.unlink()
+    def _connect(db: Path) -> apsw.Connection:
+        """Open a names database as read-only and immutable."""
+        return apsw.Connection(
+            f"{db.absolute().as_uri()}?immutable=1",
+            flags=apsw.SQLITE_OPEN_READONLY | apsw.SQLITE_OPEN_URI,
+        )
 
     @staticmethod
-    def _query_subtables(
-        cursor: apsw.Cursor,
-        result: _QueryResult,
-    ) -> None:
-        """Query a subtable for the provided ROM IDs and update the results."""
-        table_map = {
-            "region": result.region,
-            "disc": result.disc,
-            "format": result.format,
-            "additional": result.additional,
-        }
-        for table, target in table_map.items():
-            placeholders = ", ".join("?" for _ in result.row_ids)
-            query = SUBTABLE_QUERY % (table, placeholders)
-            NameDB.get_static_logger().debug(
-                "Executing query on %s for row IDs: %s", table, result.row_ids
+    def _get_filter(db: Path) -> BloomFilter | None:
+        """Load or build the bloom filter of a database's ROM values."""
+        if not (stamp := db.with_suffix(NAMES_DB_STAMP_EXT)).is_file():
+            return None
+        rate = AppConfig().name_filter_fp_rate
+        tag = f"{stamp.read_text(encoding='utf8')}:{rate}"
+        path = db.with_suffix(NAMES_DB_FILTER_EXT)
+        if (bloom := BloomFilter.load(path, tag)) is not None:
+            return bloom
+        NameDB.get_static_logger().info("Building filter for %s.", db.name)
+        with closing(NameDB._connect(db)) as conn, conn:
+            cursor = conn.cursor()
+            count = cursor.execute(COUNT_VALS).fetchall()[0][0]
+            bloom = BloomFilter.from_values(
+                (val for (val,) in cursor.execute(SELECT_VALS)), count, rate
             )
-            cursor.execute(query, result.row_ids)
-            if not (results := cursor.fetchall()):
-                NameDB.get_static_logger().debug(
-                    "No results found for table %s with row IDs: %s",
-                    table,
-                    result.row_ids,
-                )
+        bloom.save(path, tag)
+        return bloom
+
+    @staticmethod
+    def filter_candidates(
+        db: Path, query_vals: dict[str, list[str]]
+    ) -> dict[str, list[str]]:
+        """Drop query entries whose values cannot be in the database."""
+        NameDB._get_db(db)
+        if (bloom := NameDB._get_filter(db)) is None:
+            return query_vals
+        return {
+            k: v for k, v in query_vals.items() if any(i in bloom for i in v)
+        }
+
+    @staticmethod
+    def title_key(title: str) -> str:
+        """Normalise a title for case and punctuation insensitive matching."""
+        return TITLE_KEY_PATTERN.sub(" ", title).strip().casefold()
+
+    @staticmethod
+    def _get_title_index(db: Path) -> Path | None:
+        """Build the full text index of titles and names if required."""
+        if not (stamp := db.with_suffix(NAMES_DB_STAMP_EXT)).is_file():
+            return None
+        tag = f"{stamp.read_text(encoding='utf8')}:{TITLE_INDEX_VERSION}"
+        index = db.with_suffix(NAMES_DB_INDEX_EXT)
+        if index.is_file():
+            with (
+                suppress(apsw.Error),
+                closing(apsw.Connection(str(index))) as conn,
+            ):
+                rows = conn.cursor().execute(SELECT_TITLE_INDEX_TAG).fetchall()
+                if rows and rows[0][0] == tag:
+                    return index
+            index.unlink()
+        NameDB.get_static_logger().info(
+            "Building title index for %s.", db.name
+        )
+        with closing(NameDB._connect(db)) as conn, conn:
+            titles = [
+                (key, val)
+                for title, name, val in conn.cursor().execute(SELECT_TITLES)
+                for key in {
+                    NameDB.title_key(title or ""),
+                    NameDB.title_key(name or ""),
+                }
+                if key
+            ]
+        with closing(apsw.Connection(str(index))) as conn, conn:
+            cursor = conn.cursor()
+            cursor.execute(CREATE_TITLE_INDEX)
+            cursor.executemany(INSERT_TITLE, titles)
+            cursor.execute(INSERT_TITLE_INDEX_TAG, (tag,))
+        return index
+
+    @staticmethod
+    def _match_title(cursor: apsw.Cursor, title: str) -> str | None:
+        """Return the value of the most similar of the best ranked titles.
+
+        Titles numbered differently, such as sequels, never match.
+        """
+        key = NameDB.title_key(title)
+        numbers = TITLE_NUMBER_PATTERN.findall(key)
+        terms = [
+            '"{}"'.format(word.replace('"', '""'))
+            for word in key.split()
+            if len(word) >= TITLE_KEY_MIN_LENGTH
+        ]
+        if not terms:
+            return None
+        best, best_ratio = None, TITLE_MATCH_MIN_RATIO
+        for match, val in cursor.execute(MATCH_TITLE, (" OR ".join(terms),)):
+            if TITLE_NUMBER_PATTERN.findall(match) != numbers:
                 continue
-            for row in [NameDB._SubtableResult.factory(r) for r in results]:
-                target.setdefault(row.row_id, []).append(row.name)
-                NameDB.get_static_logger().debug(
-                    "Added %s to %s for row ID %d", row.name, table, row.row_id
-                )
+            ratio = SequenceMatcher(None, key, match).ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = str(val), ratio
+        return best
+
+    @classmethod
+    def match_titles(
+        cls, db: Path, query_vals: dict[str, tuple[str, list[str]]]
+    ) -> dict[str, RomDetail]:
+        """Resolve paths by title when their CRCs are not in the database."""
+        if not query_vals:
+            return {}
+        NameDB._get_db(db)
+        if (index := NameDB._get_title_index(db)) is None:
+            return {}
+        with closing(apsw.Connection(str(index))) as conn:
+            cursor = conn.cursor()
+            matched = {
+                path: val
+                for path, (title, _) in query_vals.items()
+                if (val := NameDB._match_title(cursor, title))
+            }
+        if not matched:
+            return {}
+        with closing(NameDB._connect(db)) as conn, conn:
+            roms = NameDB._fetch_rom_details(
+                conn.cursor(), set(matched.values())
+            )
+        NameDB.get_static_logger().info(
+            "Matched %d of %d ROMs by title.", len(matched), len(query_vals)
+        )
+        return {
+            path: roms[val].to_detail(
+                path, TITLE_ID_METHOD, str(query_vals[path][1])
+            )
+            for path, val in matched.items()
+            if val in roms
+        }
 
     @staticmethod
     def _fetch_rom_details(
         cursor: apsw.Cursor,
         query_vals: set[str],
-    ) -> list["NameDB._RomResult"]:
-        """Fetch ROM details from database for provided query values."""
-        query = ROM_QUERY % ", ".join("?" for _ in query_vals)
+    ) -> dict[str, "NameDB._RomResult"]:
+        """Fetch ROM details and subtable names keyed by ROM value."""
         NameDB.get_static_logger().debug(
-            "Executing fetch ROM details query for values: %s", query_vals
+            "Executing fetch ROM details query for %d values.", len(query_vals)
         )
-        cursor.execute(query, list(query_vals))
-        results = [NameDB._RomResult.factory(r) for r in cursor.fetchall()]
+        cursor.execute(CREATE_QUERY_TABLE)
+        cursor.executemany(INSERT_QUERY_VAL, ((v,) for v in query_vals))
+        results: dict[str, NameDB._RomResult] = {}
+        for row in cursor.execute(ROM_QUERY):
+            rom = NameDB._RomResult.factory(row)
+            results.setdefault(rom.rom_id, rom)
         NameDB.get_static_logger().debug(
             "Fetched %d ROM details.", len(results)
         )
@@ -170,7 +368,7 @@ class NameDB(ClassSingleton):
     @staticmethod
     def _check_result(result: _QueryResult, rom_id: str, path: str) -> bool:
         """Check if a rom result is valid for processing."""
-        if rom_id not in result.rom_vals:
+        if rom_id not in result.roms:
             NameDB.get_static_logger().debug(
                 "ROM ID %s not in result values.", rom_id
             )
@@ -203,27 +401,29 @@ class NameDB(ClassSingleton):
                 "Skipping processing for ROM ID %s and path %s.", rom_id, path
             )
             return
-        rom = result.roms[result.rom_vals.index(rom_id)]
-        result.processed[path] = RomDetail(
-            title=rom.title,
-            parent=Path(path).parts[0],
-            item_path=path,
-            name=rom.name,
-            source=rom.source,
-            id="" if id_method == ARCADE_ID_METHOD else rom.rom_id,
-            id_method=id_method,
-            year=rom.year,
-            version=rom.version,
-            hack=rom.hack,
-            region=result.region.get(rom.row_id, []),
-            disc=result.disc.get(rom.row_id, []),
-            format=result.format.get(rom.row_id, []),
-            additional=result.additional.get(rom.row_id, []),
+        rom = result.roms[rom_id]
+        result.processed[path] = rom.to_detail(
+            path, id_method, "" if id_method == ARCADE_ID_METHOD else rom_id
         )
         NameDB.get_static_logger().debug(
             "Processed result for path %s: %s", path, result.processed[path]
         )
 
+    @classmethod
+    def _run_query(
+        cls,
+        cursor: apsw.Cursor,
+        query_vals: dict[str, list[str]],
+        id_method: str,
+    ) -> dict[str, RomDetail]:
+        """Match the query values against an open name database."""
+        result = cls._QueryResult(query_vals)
+        result.roms = NameDB._fetch_rom_details(cursor, result.terms)
+        for path, ids in result.query.items():
+            for rom_id in ids:
+                cls._process_result(result, rom_id, path, id_method)
+        return result.processed
+
     @classmethod
     def query(
         cls,
@@ -237,16 +437,11 @@ class NameDB(ClassSingleton):
             )
             return {}
         NameDB._get_db(db)
-        result = cls._QueryResult(query_vals)
-        with apsw.Connection(str(db)) as conn:
-            cursor = conn.cursor()
-            result.roms = NameDB._fetch_rom_details(cursor, result.terms)
-            NameDB._query_subtables(cursor, result)
-            for path, ids in result.query.items():
-                for rom_id in ids:
-                    cls._process_result(result, rom_id, path, DB_ID_METHOD[db])
+        with closing(NameDB._connect(db)) as conn, conn:
+            processed = cls._run_query(
+                conn.cursor(), query_vals, DB_ID_METHOD[db]
+            )
         NameDB.get_static_logger().debug(
-            "Query completed with processed results: %s",
-            result.processed.keys(),
+            "Query completed with processed results: %s", processed.keys()
         )
-        return result.processed
+        return processed
@@ -1,18 +1,27 @@
 """Defines the ROM naming preferences menu."""
 
-import ast
-import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from dataclasses import dataclass, field, replace
+from os import stat_result
 from pathlib import Path
 
 from data.model.rom_detail import RomDetail
 from data.parser.filename_parser import FilenameParser
 from data.source.name_db import NameDB
+from data.source.rom_manifest import RomManifest
+from data.source.rom_store import RomStore
 from data.validator.rom_validator import RomValidator
+from data.validator.rom_walker import RomWalker
 from shared.app_config import AppConfig
 from shared.classes.class_singleton import ClassSingleton
 from shared.constants import (
     APP_ROM_DB_PATH,
+    APP_ROM_STORE_PATH,
     ARCADE_ID_METHOD,
     ARCADE_NAMES_DB,
     ARCADE_NAMING_SYSTEMS,
@@ -25,17 +34,36 @@ from shared.constants import (
     STOCK_STR,
 )
 from shared.tools import util
-from shared.tools.enhanced_json_encoder import EnhancedJSONEncoder
 
 
 class RomDB(ClassSingleton):
     """A singleton class to manage ROM details and naming preferences."""
 
+    @dataclass
+    class _BatchResult:
+        """Holds the ROM data collected from a batch of files."""
+
+        db: dict[str, RomDetail] = field(default_factory=dict)
+        arcade_roms: dict[str, list[str]] = field(default_factory=dict)
+        console_roms: dict[str, list[str]] = field(default_factory=dict)
+
+    @dataclass
+    class _HashJob:
+        """Represents a console ROM queued on the hashing pool."""
+
+        key: str
+        current: RomDetail | None
+        stat: stat_result
+        future: Future[list[str]]
+
     def __init__(self) -> None:
         super().__init__()
         self._validator = RomValidator()
         self._db: dict[str, RomDetail] = {}
         self._parser = FilenameParser()
+        self._manifest = RomManifest()
+        self._store = RomStore()
+        self._dirty: set[str] = set()
 
     @property
     def data(self) -> dict[str, RomDetail]:
@@ -43,6 +71,11 @@ class RomDB(ClassSingleton):
         self._load_db()
         return self._db
 
+    @property
+    def stored(self) -> dict[str, RomDetail]:
+        """Return the current ROM database without validating paths."""
+        return self._db or self._store.load()
+
     @property
     def valid_paths(self) -> list[Path]:
         """Load and return valid ROM paths."""
@@ -66,36 +99,42 @@ class RomDB(ClassSingleton):
             AppConfig().save()
         else:
             self._load_db()
-        valid_files: list[tuple[Path, RomDetail | None]] = []
-        for path in ROM_PATH.rglob("*"):
-            if not self._validator.check_path(path):
-                continue
-            rel_path = path.relative_to(ROM_PATH)
+        previous = self._db
+        valid_files: list[tuple[Path, RomDetail | None, stat_result]] = []
+        for rel_path, stat in RomWalker().walk():
             current = self._db.get("/".join(rel_path.parts))
-            valid_files.append((rel_path, current))
+            valid_files.append((rel_path, current, stat))
         self._logger.debug("Processing %d valid files.", len(valid_files))
         self._process_files_in_batches(valid_files)
+        self._dirty.update(
+            k for k, v in self._db.items() if previous.get(k) is not v
+        )
         self.save_db()
+        self._manifest.save("/".join(p.parts) for p, _, _ in valid_files)
 
     def _get_unmatched(self) -> None:
-        """Output unmatched crcs to file."""
-        unmatched: dict[str, RomDetail] = {
-            ast.literal_eval(v.id)[0]: v
-            for _, v in self._db.items()
-            if v.id_method == FILE_ID_METHOD
-        }
-        for k, v in unmatched.items():
-            v.id_method = "crc"
-            v.source = "aroma_overrides"
-            v.hack = "SET MANUALLY"
-            v.id = k
-        path = APP_ROM_DB_PATH.parent / "unmatched_items.json"
-        with path.open("w", encoding="utf8") as file:
-            json.dump(unmatched, file, indent=4, cls=EnhancedJSONEncoder)
+        """Output unmatched crcs to file without altering the database."""
+        unmatched: dict[str, RomDetail] = {}
+        for v in self._db.values():
+            if v.id_method != FILE_ID_METHOD:
+                continue
+            k = v.ids[0]
+            unmatched[k] = replace(
+                v,
+                id_method="crc",
+                source="aroma_overrides",
+                hack="SET MANUALLY",
+                **({"crc": v.crc[:1]} if v.crc else {"id": k}),
+            )
+        util.stream_json(
+            unmatched.items(),
+            APP_ROM_DB_PATH.parent / "unmatched_items.json",
+            ensure_ascii=True,
+        )
 
     def _process_files_in_batches(
         self,
-        files: list[tuple[Path, RomDetail | None]],
+        files: list[tuple[Path, RomDetail | None, stat_result]],
         batch_size: int = 500,
     ) -> None:
         """Process files in batches to reduce memory pressure."""
@@ -105,33 +144,58 @@ class RomDB(ClassSingleton):
         self._logger.debug(
             "Starting to process files in batches of %d.", batch_size
         )
-        with ThreadPoolExecutor() as executor:
-            future_to_batch = {
-                executor.submit(
-                    self._collect_rom_data,
-                    files[i : i + batch_size],
-                    arcade_roms,
-                    console_roms,
-                ): i
-                for i in range(0, len(files), batch_size)
-            }
-            for future in as_completed(future_to_batch):
-                future.result()
+        with self._create_hash_executor() as executor:
+            for i in range(0, len(files), batch_size):
+                batch = self._collect_rom_data(
+                    files[i : i + batch_size], executor
+                )
+                self._db.update(batch.db)
+                arcade_roms.update(batch.arcade_roms)
+                console_roms.update(batch.console_roms)
         self._logger.info("Fetched arcade and console ROM data.")
         if console_roms:
-            self._db.update(NameDB.query(CONSOLE_NAMES_DB, console_roms))
+            self._db.update(self._query_names(CONSOLE_NAMES_DB, console_roms))
         if arcade_roms:
-            self._db.update(NameDB.query(ARCADE_NAMES_DB, arcade_roms))
+            self._db.update(self._query_names(ARCADE_NAMES_DB, arcade_roms))
         self._process_remaining_files(files, {**arcade_roms, **console_roms})
 
+    def _query_names(
+        self, db: Path, roms: dict[str, list[str]]
+    ) -> dict[str, RomDetail]:
+        """Query a names database, skipping ROMs its filter rules out."""
+        candidates = NameDB.filter_candidates(db, roms)
+        result = NameDB.query(db, candidates)
+        self._logger.info(
+            "Name filter for %s: %d of %d ROMs skipped SQLite, "
+            "%d of %d candidates unmatched (target false positive rate "
+            "%.2f%%).",
+            db.name,
+            len(roms) - len(candidates),
+            len(roms),
+            len(candidates) - len(result),
+            len(candidates),
+            AppConfig().name_filter_fp_rate * 100,
+        )
+        return result
+
+    def _create_hash_executor(self) -> Executor:
+        """Create the shared worker pool used to hash console ROMs."""
+        workers = AppConfig().hash_cpu_workers
+        if AppConfig().hash_use_processes:
+            self._logger.debug("Hashing ROMs with %d processes.", workers)
+            return ProcessPoolExecutor(max_workers=workers)
+        self._logger.debug("Hashing ROMs with %d threads.", workers)
+        return ThreadPoolExecutor(max_workers=workers)
+
     def _collect_rom_data(
         self,
-        files: list[tuple[Path, RomDetail | None]],
-        arcade_roms: dict[str, list[str]],
-        console_roms: dict[str, list[str]],
-    ) -> None:
+        files: list[tuple[Path, RomDetail | None, stat_result]],
+        executor: Executor,
+    ) -> "RomDB._BatchResult":
         """Collect ROM data for querying."""
-        for path, current in files:
+        result = self._BatchResult()
+        jobs: list[RomDB._HashJob] = []
+        for path, current, stat in files:
             system = path.parts[0]
             if system in NAMING_EXCLUDE_SYSTEMS:
                 self._logger.debug(
@@ -139,78 +203,100 @@ class RomDB(ClassSingleton):
                 )
                 continue
             if system in ARCADE_NAMING_SYSTEMS:
-                self._process_arcade_rom(path, current, arcade_roms)
-            else:
-                self._process_console_rom(path, current, console_roms)
+                self._process_arcade_rom(path, current, result)
+            elif job := self._process_console_rom(
+                path, current, stat, result, executor
+            ):
+                jobs.append(job)
+        for job in jobs:
+            crc = job.future.result()
+            self._manifest.set_crc(job.key, job.stat, crc)
+            self._add_console_crc(job.key, job.current, crc, result)
+        return result
 
     def _process_arcade_rom(
         self,
         path: Path,
         current: RomDetail | None,
-        arcade_roms: dict[str, list[str]],
+        result: "RomDB._BatchResult",
     ) -> None:
         """Process an arcade ROM file and update the database accordingly."""
         key = "/".join(path.parts)
         if current and current.id_method == ARCADE_ID_METHOD:
-            self._db[key] = current
+            result.db[key] = current
             self._logger.debug(
                 "Arcade ROM %s already exists in database.", key
             )
             return
-        arcade_roms[key] = [path.stem]
+        result.arcade_roms[key] = [path.stem]
         self._logger.debug("Added arcade ROM %s for processing.", key)
 
     def _process_console_rom(
         self,
         path: Path,
         current: RomDetail | None,
-        console_roms: dict[str, list[str]],
-    ) -> None:
-        """Process a console ROM file based on its type."""
+        stat: stat_result,
+        result: "RomDB._BatchResult",
+        executor: Executor,
+    ) -> "RomDB._HashJob | None":
+        """Process a console ROM, queueing it for hashing if it changed."""
         if AppConfig().console_naming == STOCK_STR:
             self._logger.debug(
                 "Console naming is set to stock; skipping %s.", path
             )
-            return
+            return None
         key = "/".join(path.parts)
         if current and current.id_method == CONSOLE_ID_METHOD:
-            self._db[key] = current
+            result.db[key] = current
             self._logger.debug(
                 "Console ROM %s already exists in database.", key
             )
+            return None
+        if (crc := self._manifest.get_crc(key, stat)) is not None:
+            self._add_console_crc(key, current, crc, result)
+            return None
+        func = (
+            self._process_compressed_rom
+            if path.suffix in {".zip", ".7z"}
+            else self._process_regular_rom
+        )
+        return self._HashJob(key, current, stat, executor.submit(func, path))
+
+    def _add_console_crc(
+        self,
+        key: str,
+        current: RomDetail | None,
+        crc: list[str],
+        result: "RomDB._BatchResult",
+    ) -> None:
+        """Add the CRCs of a console ROM to the batch result."""
+        if not crc:
             return
-        with ThreadPoolExecutor() as executor:
-            func = (
-                self._process_compressed_rom
-                if path.suffix in {".zip", ".7z"}
-                else self._process_regular_rom
+        if (
+            current
+            and current.id_method == FILE_ID_METHOD
+            and current.has_ids(crc)
+        ):
+            result.db[key] = current
+            self._logger.debug(
+                "Processed console ROM %s with result %s.", key, crc
             )
-            future = executor.submit(func, path)
-            if result := future.result():
-                if (
-                    current
-                    and current.id_method == FILE_ID_METHOD
-                    and current.id == str(result)
-                ):
-                    self._db[key] = current
-                    self._logger.debug(
-                        "Processed console ROM %s with result %s.", key, result
-                    )
-                    return
-                console_roms[key] = result
-                self._logger.debug(
-                    "Processed console ROM %s with result %s.", key, result
-                )
+            return
+        result.console_roms[key] = crc
+        self._logger.debug(
+            "Processed console ROM %s with result %s.", key, crc
+        )
 
-    def _process_compressed_rom(self, path: Path) -> list[str]:
+    @staticmethod
+    def _process_compressed_rom(path: Path) -> list[str]:
         """Process ROMs that are contained in compressed archives."""
         archive_info = util.get_archive_info(ROM_PATH / path)
         valid_crcs = [
             zf.crc
             for zf in archive_info
-            if self._validator.has_valid_ext(ROM_PATH / path / zf.filename)
+            if RomValidator.has_valid_ext(ROM_PATH / path / zf.filename)
         ]
-        self._logger.debug(
+        RomDB.get_static_logger().debug(
             "Found %d valid CRCs in compressed ROM %s.", len(valid_crcs), path
         )
         return valid_crcs
@@ -226,11 +312,12 @@ class RomDB(ClassSingleton):
 
     def _process_remaining_files(
         self,
-        files: list[tuple[Path, RomDetail | None]],
+        files: list[tuple[Path, RomDetail | None, stat_result]],
         all_roms: dict[str, list[str]],
     ) -> None:
         """Handle remaining files not present in the name databases."""
-        for path, current in files:
+        pending: list[tuple[str, Path, list[str] | None]] = []
+        for path, current, _ in files:
             if (key := "/".join(path.parts)) in self._db:
                 self._logger.debug("ROM %s already processed; skipping.", key)
                 continue
@@ -240,28 +327,42 @@ class RomDB(ClassSingleton):
                     "Added excluded system ROM %s directly to database.", key
                 )
                 continue
-            if (
-                (ids := all_roms.get(key))
-                and current
-                and current.id == str(ids)
-            ):
+            if (ids := all_roms.get(key)) and current and current.has_ids(ids):
                 self._db[key] = current
                 self._logger.debug(
                     "Added unchanged ROM %s directly to database.", key
                 )
                 continue
-            self._db[key] = self._parser.parse(path, ids)
+            pending.append((key, path, ids))
+        titles = NameDB.match_titles(
+            CONSOLE_NAMES_DB,
+            {
+                key: (path.stem, ids)
+                for key, path, ids in pending
+                if ids and path.parts[0] not in ARCADE_NAMING_SYSTEMS
+            },
+        )
+        parsed = self._parser.parse_many(
+            (path for key, path, _ in pending if key not in titles),
+            {path: ids for _, path, ids in pending},
+        )
+        for key, path, _ in pending:
+            if key in titles:
+                self._db[key] = titles[key]
+                self._logger.debug("Matched ROM %s by title.", key)
+                continue
+            self._db[key] = parsed[path]
             self._logger.debug("Parsed ROM %s and added to database.", key)
 
     def _load_db(self) -> None:
-        """Load the ROM database from a JSON file and validate the paths."""
+        """Load the ROM database from the store and validate the paths."""
         if not self._db:
             RomDB.get_static_logger().info(
-                "Loading ROM database from %s.", APP_ROM_DB_PATH
+                "Loading ROM database from %s.", APP_ROM_STORE_PATH
             )
             self._db = {
-                k: RomDetail(**v)
-                for k, v in util.load_simple_json(APP_ROM_DB_PATH).items()
+                k: v
+                for k, v in self._store.load().items()
                 if self._validator.check_path(ROM_PATH / k)
             }
             RomDB.get_static_logger().info(
@@ -269,9 +370,9 @@ class RomDB(ClassSingleton):
             )
 
     def save_db(self) -> None:
-        """Save the current ROM database to a JSON file."""
+        """Save the changed entries of the ROM database to the store."""
         RomDB.get_static_logger().info(
-            "Saving ROM database to %s.", APP_ROM_DB_PATH
+            "Saving ROM database to %s.", APP_ROM_STORE_PATH
         )
-        with APP_ROM_DB_PATH.open("w", encoding="utf8") as file:
-            json.dump(self._db, file, indent=4, cls=EnhancedJSONEncoder)
+        self._store.save(self._db, self._dirty)
+        self._dirty.clear()
@@ -0,0 +1,58 @@
+"""Manages the persistent fingerprint manifest of scanned ROM files."""
+
+from collections.abc import Iterable
+from os import stat_result
+
+from data.model.manifest_entry import ManifestEntry
+from shared.classes.class_singleton import ClassSingleton
+from shared.constants import APP_ROM_MANIFEST_PATH
+from shared.tools import util
+
+
+class RomManifest(ClassSingleton):
+    """A singleton class to track ROM fingerprints and their CRCs."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._entries: dict[str, ManifestEntry] = {}
+        self._loaded = False
+
+    def get_crc(self, key: str, stat: stat_result) -> list[str] | None:
+        """Return stored CRCs for a ROM if its fingerprint is unchanged."""
+        self._load()
+        entry = self._entries.get(key)
+        if entry is None or not entry.matches(stat):
+            return None
+        self._logger.debug("Fingerprint unchanged for %s.", key)
+        return entry.crc
+
+    def set_crc(self, key: str, stat: stat_result, crc: list[str]) -> None:
+        """Store the fingerprint and computed CRCs for a ROM."""
+        self._load()
+        self._entries[key] = ManifestEntry.from_stat(stat, crc)
+
+    def _load(self) -> None:
+        """Load the manifest from file if not already loaded."""
+        if self._loaded:
+            return
+        self._logger.info(
+            "Loading ROM manifest from %s.", APP_ROM_MANIFEST_PATH
+        )
+        self._entries = {
+            k: ManifestEntry(**v)
+            for k, v in util.load_simple_json(APP_ROM_MANIFEST_PATH).items()
+        }
+        self._loaded = True
+        self._logger.info("Loaded %d manifest entries.", len(self._entries))
+
+    def save(self, valid_keys: Iterable[str]) -> None:
+        """Prune entries for missing ROMs and save the manifest to file."""
+        self._load()
+        keep = set(valid_keys)
+        self._entries = {k: v for k, v in self._entries.items() if k in keep}
+        self._logger.info(
+            "Saving %d manifest entries to %s.",
+            len(self._entries),
+            APP_ROM_MANIFEST_PATH,
+        )
+        util.save_simple_json(self._entries, APP_ROM_MANIFEST_PATH)
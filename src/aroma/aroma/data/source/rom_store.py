@@ -0,0 +1,115 @@
+"""Persists ROM details in an indexed SQLite database."""
+
+import json
+from collections.abc import Collection
+from contextlib import closing
+
+import apsw
+from data.model.rom_detail import RomDetail
+from shared.classes.class_singleton import ClassSingleton
+from shared.constants import APP_ROM_DB_PATH, APP_ROM_STORE_PATH, BACKUP_EXT
+from shared.tools import util
+from shared.tools.enhanced_json_encoder import dataclass_to_dict
+
+CREATE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS rom (
+        path TEXT PRIMARY KEY NOT NULL,
+        system TEXT NOT NULL,
+        id TEXT NOT NULL DEFAULT '',
+        id_method TEXT NOT NULL DEFAULT '',
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS rom_system ON rom (system);
+    CREATE INDEX IF NOT EXISTS rom_id ON rom (id);
+    CREATE INDEX IF NOT EXISTS rom_id_method ON rom (id_method);
+"""
+
+SELECT_ALL = "SELECT path, data FROM rom"
+SELECT_PATHS = "SELECT path FROM rom"
+COUNT_ROWS = "SELECT COUNT(*) FROM rom"
+
+UPSERT_STATEMENT = """
+    INSERT INTO rom (path, system, id, id_method, data)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (path) DO UPDATE SET
+        system = excluded.system,
+        id = excluded.id,
+        id_method = excluded.id_method,
+        data = excluded.data
+"""
+DELETE_STATEMENT = "DELETE FROM rom WHERE path = ?"
+
+
+class RomStore(ClassSingleton):
+    """A singleton class to load and save ROM details using SQLite."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._keys: set[str] | None = None
+        self._prepared = False
+
+    def _connect(self) -> apsw.Connection:
+        """Open the store, creating and migrating the schema on first use."""
+        APP_ROM_STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = apsw.Connection(str(APP_ROM_STORE_PATH))
+        if not self._prepared:
+            conn.cursor().execute(CREATE_SCHEMA)
+            self._migrate_json(conn)
+            self._prepared = True
+        return conn
+
+    @staticmethod
+    def _migrate_json(conn: apsw.Connection) -> None:
+        """Import the legacy JSON database once, then back it up."""
+        if not APP_ROM_DB_PATH.is_file():
+            return
+        cursor = conn.cursor()
+        if cursor.execute(COUNT_ROWS).fetchall()[0][0]:
+            return
+        logger = RomStore.get_static_logger()
+        logger.info("Migrating ROM database from %s.", APP_ROM_DB_PATH)
+        legacy = {
+            k: RomDetail.from_dict(v)
+            for k, v in util.load_simple_json(APP_ROM_DB_PATH).items()
+        }
+        with conn:
+            cursor.executemany(
+                UPSERT_STATEMENT,
+                [RomStore._to_row(k, v) for k, v in legacy.items()],
+            )
+        util.rename_file(
+            APP_ROM_DB_PATH, APP_ROM_DB_PATH.with_suffix(BACKUP_EXT)
+        )
+        logger.info("Migrated %d ROM details.", len(legacy))
+
+    @staticmethod
+    def _to_row(key: str, rom: RomDetail) -> tuple[str, str, str, str, str]:
+        """Generate a tuple for database insertion."""
+        data = json.dumps(dataclass_to_dict(rom), ensure_ascii=False)
+        return (key, rom.parent, rom.full_id, rom.id_method, data)
+
+    def load(self) -> dict[str, RomDetail]:
+        """Load every stored ROM detail."""
+        with closing(self._connect()) as conn, conn:
+            rows: dict[str, str] = dict(conn.cursor().execute(SELECT_ALL))
+        self._keys = set(rows)
+        return {k: RomDetail.from_dict(json.loads(v)) for k, v in rows.items()}
+
+    def save(self, db: dict[str, RomDetail], dirty: Collection[str]) -> None:
+        """Write the dirty ROM details and delete those no longer present."""
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.cursor()
+            if self._keys is None:
+                self._keys = {k for (k,) in cursor.execute(SELECT_PATHS)}
+            upserts = [self._to_row(k, db[k]) for k in dirty if k in db]
+            deletes = [(k,) for k in self._keys - db.keys()]
+            if upserts:
+                cursor.executemany(UPSERT_STATEMENT, upserts)
+            if deletes:
+                cursor.executemany(DELETE_STATEMENT, deletes)
+        self._keys = set(db)
+        self._logger.info(
+            "Saved ROM database: %d upserted, %d deleted.",
+            len(upserts),
+            len(deletes),
+        )
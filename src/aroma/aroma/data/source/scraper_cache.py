@@ -0,0 +1,120 @@
+"""Persists ScreenScraper game lookups in an SQLite cache."""
+
+import json
+import threading
+from typing import Any
+
+import apsw
+from shared.app_config import AppConfig
+from shared.classes.class_singleton import ClassSingleton
+from shared.constants import (
+    APP_SCRAPER_CACHE_PATH,
+    SCRAPER_CACHE_HIT_DAYS,
+    SCRAPER_CACHE_MISS_DAYS,
+)
+from shared.tools import util
+
+CREATE_SCHEMA = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    CREATE TABLE IF NOT EXISTS lookup (
+        kind TEXT NOT NULL,
+        value TEXT NOT NULL,
+        system TEXT NOT NULL,
+        medias TEXT NOT NULL,
+        datestamp INTEGER NOT NULL,
+        PRIMARY KEY (kind, value, system)
+    ) WITHOUT ROWID;
+"""
+
+SELECT_STATEMENT = """
+    SELECT medias, datestamp FROM lookup
+    WHERE kind = ? AND value = ? AND system = ?
+"""
+UPSERT_STATEMENT = """
+    INSERT OR REPLACE INTO lookup (kind, value, system, medias, datestamp)
+    VALUES (?, ?, ?, ?, ?)
+"""
+PRUNE_STATEMENT = """
+    DELETE FROM lookup
+    WHERE datestamp <= CASE medias WHEN 'null' THEN ? ELSE ? END
+"""
+
+
+class ScraperCache(ClassSingleton):
+    """A singleton class to cache ScreenScraper media lookups using SQLite."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        self._conn: apsw.Connection | None = None
+
+    @staticmethod
+    def _miss_days() -> int:
+        """Return the TTL of misses, expiring before a ROM's next attempt."""
+        days = AppConfig().days_until_scrape_attempt
+        if days < 0:
+            return SCRAPER_CACHE_MISS_DAYS
+        return min(days, SCRAPER_CACHE_MISS_DAYS)
+
+    @staticmethod
+    def _expired(medias: list[Any] | None, datestamp: int, today: int) -> bool:
+        """Check if a lookup is as old as the TTL for hits or misses."""
+        if medias is None:
+            return datestamp <= today - ScraperCache._miss_days()
+        return datestamp <= today - SCRAPER_CACHE_HIT_DAYS
+
+    def _connect(self) -> apsw.Connection:
+        """Open the cache once, creating the schema and pruning old rows."""
+        if self._conn is None:
+            APP_SCRAPER_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            conn = apsw.Connection(str(APP_SCRAPER_CACHE_PATH))
+            cursor = conn.cursor()
+            cursor.execute(CREATE_SCHEMA).fetchall()
+            today = util.get_datestamp()
+            with conn:
+                cursor.execute(
+                    PRUNE_STATEMENT,
+                    (
+                        today - self._miss_days(),
+                        today - SCRAPER_CACHE_HIT_DAYS,
+                    ),
+                )
+            self._conn = conn
+        return self._conn
+
+    def get(
+        self, kind: str, value: str, system: str
+    ) -> list[dict[str, str]] | None:
+        """Return the cached media of a lookup, or None if not cached.
+
+        A game that was not found is returned as an empty list.
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .cursor()
+                .execute(SELECT_STATEMENT, (kind, value, system))
+                .fetchone()
+            )
+        if row is None:
+            return None
+        medias: list[dict[str, str]] | None = json.loads(row[0])
+        if self._expired(medias, row[1], util.get_datestamp()):
+            return None
+        return medias or []
+
+    def put(
+        self,
+        kind: str,
+        value: str,
+        system: str,
+        medias: list[dict[str, str]] | None,
+    ) -> None:
+        """Cache the media of a lookup, None marking a game not found."""
+        data = json.dumps(medias, ensure_ascii=False)
+        with self._lock:
+            self._connect().cursor().execute(
+                UPSERT_STATEMENT,
+                (kind, value, system, data, util.get_datestamp()),
+            )
@@ -1,10 +1,29 @@
 """Defines the ScreenScraper API class for fetching game media data."""
 
+import threading
+from collections.abc import Collection
+from dataclasses import asdict
+from http import HTTPStatus
 from typing import Any
 
+import requests
 from data.model.media_item import MediaItem
+from data.model.media_target import MediaTarget
+from data.model.scraper_quota import ScraperQuota
+from data.source.scraper_cache import ScraperCache
 from data.tools.http_request_handler import HttpRequestHandler
+from data.tools.rate_limiter import RateLimiter
 from shared.app_config import AppConfig
+from shared.constants import (
+    SCRAPER_MEDIA_TYPES,
+    SCRAPER_QUOTA_RESOURCE,
+    SCRAPER_QUOTA_STATUSES,
+    SCRAPER_THROTTLED_RETRIES,
+    SCRAPER_THROTTLED_STATUS,
+)
+from shared.tools import util
+
+MEDIA_FIELDS = ("type", "url", "region")
 
 
 class ScreenScraperAPI(HttpRequestHandler):
@@ -12,10 +31,120 @@ class ScreenScraperAPI(HttpRequestHandler):
 
     BASE_URL = "https://www.screenscraper.fr/api2/"
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        self.quota = ScraperQuota()
+        self.limiter = self._create_limiter()
+
+    def _create_limiter(self) -> RateLimiter:
+        """Create a rate limiter for the account's current allowance."""
+        return RateLimiter(
+            self.quota.max_requests_per_minute / 60, self.quota.max_threads
+        )
+
+    @classmethod
+    def _on_response(cls, response: requests.Response) -> None:
+        """Pass the response status to the scraper's rate limiter."""
+        cls().handle_status(response.status_code)
+
+    def handle_status(self, status: int) -> None:
+        """Adapt the rate limiter to a ScreenScraper response status."""
+        if status == SCRAPER_THROTTLED_STATUS:
+            self.limiter.throttle()
+            self._logger.warning(
+                "ScreenScraper is throttling, reduced to %d threads.",
+                self.limiter.concurrency,
+            )
+        elif status in SCRAPER_QUOTA_STATUSES:
+            with self._lock:
+                self.quota.exhaust()
+            self.limiter.stop()
+            self._logger.warning(
+                "ScreenScraper daily quota reached, stopping scrape."
+            )
+        elif status < HTTPStatus.BAD_REQUEST:
+            self.limiter.recover()
+
+    def _limited_get(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        allowed_statuses: Collection[int] = (),
+    ) -> requests.Response | None:
+        """Make a GET request within the limits, retrying if throttled."""
+        for _ in range(SCRAPER_THROTTLED_RETRIES + 1):
+            if not self.limiter.acquire():
+                return None
+            try:
+                response = self.get(
+                    url,
+                    params=params,
+                    allowed_statuses=(
+                        *allowed_statuses,
+                        SCRAPER_THROTTLED_STATUS,
+                    ),
+                )
+            finally:
+                self.limiter.release()
+            if (
+                response is None
+                or response.status_code != SCRAPER_THROTTLED_STATUS
+            ):
+                return response
+        return None
+
+    def _update_quota(
+        self, result: dict[str, Any], *, failed: bool = False
+    ) -> None:
+        """Count a request against the quota, using the reported usage."""
+        ssuser = result.get("response", {}).get("ssuser")
+        with self._lock:
+            if isinstance(ssuser, dict):
+                self.quota = ScraperQuota.from_ssuser(
+                    ssuser, util.get_datestamp()
+                )
+            else:
+                self.quota.requests_today += 1
+                self.quota.ko_today += failed
+            remaining = self.quota.remaining
+        if remaining == 0:
+            self.limiter.stop()
+
+    def load_quota(self) -> ScraperQuota:
+        """Load the account's allowance and reset the rate limiter."""
+        today = util.get_datestamp()
+        saved = ScraperQuota.from_dict(
+            util.load_simple_json(SCRAPER_QUOTA_RESOURCE)
+        )
+        self.quota = saved if saved.datestamp == today else ScraperQuota()
+        self.limiter = self._create_limiter()
+        self._make_request("ssuserInfos.php")
+        self.limiter = self._create_limiter()
+        if self.quota.remaining == 0:
+            self.limiter.stop()
+        self._logger.info(
+            "ScreenScraper allows %d threads, %s requests left today.",
+            self.quota.max_threads,
+            self.quota.remaining,
+        )
+        return self.quota
+
+    def save_quota(self) -> None:
+        """Persist the account's remaining allowance for today."""
+        with self._lock:
+            util.save_simple_json(asdict(self.quota), SCRAPER_QUOTA_RESOURCE)
+
+    def download(self, url: str) -> bytes | None:
+        """Download a media file within the account's limits."""
+        if response := self._limited_get(url):
+            return response.content
+        return None
+
     def _make_request(
         self, endpoint: str, params: dict[str, Any] | None = None
-    ) -> dict[str, Any]:
-        """Make a request to the ScreenScraper API."""
+    ) -> dict[str, Any] | None:
+        """Make a request to the ScreenScraper API, None if it failed."""
         if params is None:
             params = {}
         params.update(
@@ -30,38 +159,67 @@ class ScreenScraperAPI(HttpRequestHandler):
             }
         )
         url = f"{self.BASE_URL}{endpoint}"
-        if response := self.get(url, params=params):
-            return self.parse_json(response) or {}
-
-        return {}
+        response = self._limited_get(
+            url, params=params, allowed_statuses=(HTTPStatus.NOT_FOUND,)
+        )
+        if response is None:
+            return None
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            self._update_quota({}, failed=True)
+            return {}
+        if (result := self.parse_json(response)) is None:
+            return None
+        self._update_quota(result)
+        return result
 
-    def _get_game_media(
-        self, params: dict[str, str], region_priority: dict[str, int]
-    ) -> list[MediaItem] | None:
-        """Fetch game media data based on the given parameters."""
-        result = self._make_request("jeuInfos.php", params)
+    @staticmethod
+    def _get_medias(result: dict[str, Any]) -> list[dict[str, str]] | None:
+        """Extract the selectable media types, None if no game was found."""
         try:
-            return MediaItem.from_list(
-                result["response"]["jeu"]["medias"], region_priority
-            )
+            game = result["response"]["jeu"]
         except KeyError as e:
             ScreenScraperAPI.get_static_logger().debug(
-                "Key error while accessing media data: %s", str(e)
+                "Key error while accessing game data: %s", str(e)
             )
             return None
+        types = {
+            *SCRAPER_MEDIA_TYPES,
+            *MediaTarget.media_types(MediaTarget.from_config()),
+        }
+        return [
+            {k: m[k] for k in MEDIA_FIELDS if k in m}
+            for m in game.get("medias", [])
+            if m.get("type") in types
+        ]
+
+    def _get_game_media(
+        self,
+        kind: str,
+        value: str,
+        system: str | None,
+        region_priority: dict[str, int],
+    ) -> list[MediaItem] | None:
+        """Fetch game media, an empty list if none or None if it failed."""
+        cache = ScraperCache()
+        if (medias := cache.get(kind, value, system or "")) is None:
+            params = {kind: value}
+            if system:
+                params["systemeid"] = system
+            if (result := self._make_request("jeuInfos.php", params)) is None:
+                return None
+            medias = self._get_medias(result)
+            cache.put(kind, value, system or "", medias)
+        types = MediaTarget.media_types(MediaTarget.from_config())
+        return MediaItem.from_list(medias or [], region_priority, types)
 
     def get_game_media_by_name(
         self, name: str, system: str | None, region_priority: dict[str, int]
     ) -> list[MediaItem] | None:
         """Retrieve game media by name and optional system."""
-        params = {"romnom": name}
-        if system:
-            params["systemeid"] = system
-        return self._get_game_media(params, region_priority)
+        return self._get_game_media("romnom", name, system, region_priority)
 
     def get_game_media_by_crc(
         self, crc: str, region_priority: dict[str, int]
     ) -> list[MediaItem] | None:
         """Retrieve game media by CRC value."""
-        params = {"crc": crc}
-        return self._get_game_media(params, region_priority)
+        return self._get_game_media("crc", crc, None, region_priority)
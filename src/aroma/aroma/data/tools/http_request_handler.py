@@ -1,15 +1,29 @@
 """Handles generic HTTP requests and response parsing."""
 
 import json
+import threading
+from collections.abc import Collection
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from shared.app_config import AppConfig
 from shared.classes.class_singleton import ClassSingleton
+from shared.constants import (
+    HTTP_RETRIES,
+    HTTP_RETRY_BACKOFF,
+    HTTP_RETRY_STATUSES,
+)
+from urllib3.util.retry import Retry
 
 
 class HttpRequestHandler(ClassSingleton):
     """Handles generic HTTP requests and response parsing."""
 
+    _session: requests.Session | None = None
+    _session_pool_size = 0
+    _session_lock = threading.Lock()
+
     @staticmethod
     def _log_error(message: str, error: Exception) -> None:
         """Log an error with details."""
@@ -17,17 +31,61 @@ class HttpRequestHandler(ClassSingleton):
             "%s: %s", message, str(error)
         )
 
+    @staticmethod
+    def _create_session(pool_size: int) -> requests.Session:
+        """Create a keep-alive session with a sized, retrying pool."""
+        adapter = HTTPAdapter(
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=HTTP_RETRIES,
+                backoff_factor=HTTP_RETRY_BACKOFF,
+                status_forcelist=HTTP_RETRY_STATUSES,
+                raise_on_status=False,
+            ),
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @staticmethod
+    def session() -> requests.Session:
+        """Return the session shared by all scraping threads."""
+        pool_size = AppConfig().scrape_http_pool_size
+        with HttpRequestHandler._session_lock:
+            session = HttpRequestHandler._session
+            if session is None or (
+                HttpRequestHandler._session_pool_size != pool_size
+            ):
+                if session is not None:
+                    session.close()
+                session = HttpRequestHandler._create_session(pool_size)
+                HttpRequestHandler._session = session
+                HttpRequestHandler._session_pool_size = pool_size
+            return session
+
+    @classmethod
+    def _on_response(cls, response: requests.Response) -> None:
+        """Inspect a response before its status is checked."""
+
     @classmethod
     def get(  # type: ignore[misc]
-        cls, url: str, params: dict[str, Any] | None = None, timeout: int = 10
+        cls,
+        url: str,
+        params: dict[str, Any] | None = None,
+        timeout: int = 10,
+        allowed_statuses: Collection[int] = (),
     ) -> requests.Response | None:
-        """Make a GET request."""
+        """Make a GET request, returning allowed error statuses as is."""
         try:
-            response = requests.get(url, params=params, timeout=timeout)
+            response = cls.session().get(url, params=params, timeout=timeout)
         except requests.exceptions.RequestException as e:
             HttpRequestHandler._log_error("GET request failed", e)
             return None
 
+        cls._on_response(response)
+        if response.status_code in allowed_statuses:
+            return response
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -46,13 +104,14 @@ class HttpRequestHandler(ClassSingleton):
     ) -> requests.Response | None:
         """Make a POST request."""
         try:
-            response = requests.post(
+            response = cls.session().post(
                 url, data=data, json=json_data, timeout=timeout
             )
         except requests.exceptions.RequestException as e:
             HttpRequestHandler._log_error("POST request failed", e)
             return None
 
+        cls._on_response(response)
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
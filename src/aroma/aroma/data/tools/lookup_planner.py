@@ -0,0 +1,124 @@
+"""Runs fallback media lookups speculatively, learning what succeeds."""
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from data.model.media_item import MediaItem
+from shared.classes.class_singleton import ClassSingleton
+from shared.constants import (
+    SCRAPER_LOOKUP_MIN_CHANCE,
+    SCRAPER_LOOKUP_STATS_RESOURCE,
+    SCRAPER_LOOKUP_STATS_WINDOW,
+)
+from shared.tools import util
+
+
+@dataclass(frozen=True, slots=True)
+class Lookup:
+    """Data class for one media lookup strategy and its request."""
+
+    strategy: str
+    fetch: Callable[[], list[MediaItem] | None]
+
+
+class LookupPlanner(ClassSingleton):
+    """Resolves lookups in priority order while running them concurrently."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._stats: dict[str, dict[str, list[int]]] = {}
+
+    def load(self) -> None:
+        """Load the per system attempts and successes of each strategy."""
+        self._stats = util.load_simple_json(SCRAPER_LOOKUP_STATS_RESOURCE)
+
+    def save(self) -> None:
+        """Persist the per system attempts and successes of each strategy."""
+        util.save_simple_json(self._stats, SCRAPER_LOOKUP_STATS_RESOURCE)
+
+    def success_rate(self, system: str, strategy: str) -> float:
+        """Return the smoothed rate at which a strategy finds media."""
+        attempts, successes = self._stats.get(system, {}).get(strategy, (0, 0))
+        return (successes + 1) / (attempts + 2)
+
+    def _record(
+        self, system: str, strategy: str, result: list[MediaItem] | None
+    ) -> None:
+        """Count a definitive lookup, halving old counts past the window."""
+        if result is None:
+            return
+        counts = self._stats.setdefault(system, {}).setdefault(
+            strategy, [0, 0]
+        )
+        counts[0] += 1
+        counts[1] += bool(result)
+        if counts[0] > SCRAPER_LOOKUP_STATS_WINDOW:
+            counts[:] = [counts[0] // 2, counts[1] // 2]
+
+    def _speculate(
+        self,
+        system: str,
+        lookups: list[Lookup],
+        unresolved: list[int],
+        slots: int,
+    ) -> list[int]:
+        """Return the unresolved lookups worth running, in priority order."""
+        wanted: list[int] = []
+        chance = 1.0
+        for i in unresolved:
+            if len(wanted) >= slots or chance < SCRAPER_LOOKUP_MIN_CHANCE:
+                break
+            wanted.append(i)
+            chance *= 1 - self.success_rate(system, lookups[i].strategy)
+        return wanted
+
+    async def resolve(
+        self,
+        system: str,
+        lookups: list[Lookup],
+        executor: ThreadPoolExecutor,
+        budget: int,
+    ) -> list[MediaItem] | None:
+        """Return the first successful lookup in priority order.
+
+        Lookups run in priority order, up to the budget at once. A lower
+        priority lookup only starts early while the learned success rates
+        make it likely that every lookup ahead of it fails. Without a
+        success, return an empty list if every lookup found nothing, or
+        None if any of them failed.
+        """
+        loop = asyncio.get_running_loop()
+        running: dict[asyncio.Future[list[MediaItem] | None], int] = {}
+        results: dict[int, list[MediaItem] | None] = {}
+        best = len(lookups)
+        try:
+            while unresolved := [i for i in range(best) if i not in results]:
+                launched = set(running.values())
+                for i in self._speculate(
+                    system, lookups, unresolved, max(budget, 1)
+                ):
+                    if i not in launched and len(running) < max(budget, 1):
+                        running[
+                            loop.run_in_executor(executor, lookups[i].fetch)
+                        ] = i
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    i = running.pop(future)
+                    results[i] = future.result()
+                    self._record(system, lookups[i].strategy, results[i])
+                    if results[i]:
+                        best = min(best, i)
+                for future, i in list(running.items()):
+                    if i > best:
+                        future.cancel()
+                        del running[future]
+        finally:
+            for future in running:
+                future.cancel()
+        if best < len(lookups):
+            return results[best]
+        return None if None in results.values() else []
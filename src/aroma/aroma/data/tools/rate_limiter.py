@@ -0,0 +1,83 @@
+"""Limits the rate and concurrency of requests shared across threads."""
+
+import threading
+import time
+from dataclasses import dataclass, field
+
+from shared.constants import SCRAPER_RECOVERY_REQUESTS
+
+
+@dataclass
+class RateLimiter:  # pylint: disable=too-many-instance-attributes
+    """Data class for a thread safe token bucket with adaptive concurrency."""
+
+    rate: float
+    max_concurrency: int
+    concurrency: int = field(init=False)
+    stopped: bool = field(default=False, init=False)
+    _tokens: float = field(default=1.0, init=False)
+    _updated: float = field(default_factory=time.monotonic, init=False)
+    _active: int = field(default=0, init=False)
+    _successes: int = field(default=0, init=False)
+    _condition: threading.Condition = field(
+        default_factory=threading.Condition, init=False
+    )
+
+    def __post_init__(self) -> None:
+        """Start with every allowed slot available."""
+        self.max_concurrency = max(self.max_concurrency, 1)
+        self.concurrency = self.max_concurrency
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill, up to the burst."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._tokens + (now - self._updated) * self.rate,
+            self.concurrency,
+        )
+        self._updated = now
+
+    def acquire(self) -> bool:
+        """Wait for a token and a free slot, or return False once stopped."""
+        with self._condition:
+            while not self.stopped:
+                self._refill()
+                if self._active < self.concurrency and self._tokens >= 1:
+                    self._tokens -= 1
+                    self._active += 1
+                    return True
+                timeout = None
+                if self._active < self.concurrency:
+                    timeout = (1 - self._tokens) / self.rate
+                self._condition.wait(timeout)
+            return False
+
+    def release(self) -> None:
+        """Free the slot taken by a finished request."""
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    def throttle(self) -> None:
+        """Halve the concurrency and empty the bucket after a rejection."""
+        with self._condition:
+            self.concurrency = max(self.concurrency // 2, 1)
+            self._tokens = 0
+            self._successes = 0
+
+    def recover(self) -> None:
+        """Restore a slot after a run of successful requests."""
+        with self._condition:
+            if self.concurrency >= self.max_concurrency:
+                return
+            self._successes += 1
+            if self._successes >= self.concurrency * SCRAPER_RECOVERY_REQUESTS:
+                self.concurrency += 1
+                self._successes = 0
+                self._condition.notify_all()
+
+    def stop(self) -> None:
+        """Refuse all further requests and wake any waiting threads."""
+        with self._condition:
+            self.stopped = True
+            self._condition.notify_all()
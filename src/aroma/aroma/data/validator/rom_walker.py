@@ -0,0 +1,107 @@
+"""Walks the ROM directory tree and yields valid ROM files."""
+
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass
+from os import stat_result
+from pathlib import Path
+
+from data.source.emu_config_handler import EmuConfigHandler
+from manager.emu_manager import EmuManager
+from shared.classes.class_base import ClassBase
+from shared.constants import (
+    ROM_DB_IGNORE_EXT,
+    ROM_DB_IGNORE_WORDS,
+    ROM_PATH,
+)
+
+HIDDEN_PREFIX = "."
+
+
+class RomWalker(ClassBase):
+    """Walks ROM_PATH with os.scandir, pruning invalid directories."""
+
+    @dataclass(frozen=True)
+    class _SystemRules:
+        """Holds the precompiled validation rules for a system."""
+
+        valid_ext: frozenset[str] | None
+        ignore_ext: frozenset[str]
+        ignore_words: tuple[str, ...]
+
+        def accepts(self, name: str) -> bool:
+            """Check if a file name passes the system's rules."""
+            stem, ext = RomWalker.split_name(name)
+            if ext in self.ignore_ext:
+                return False
+            if any(word in stem for word in self.ignore_words):
+                return False
+            return self.valid_ext is None or ext in self.valid_ext
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._rules: dict[str, RomWalker._SystemRules] = {}
+
+    @staticmethod
+    def split_name(name: str) -> tuple[str, str]:
+        """Split a file name into its stem and lowercase extension."""
+        i = name.rfind(".")
+        if 0 < i < len(name) - 1:
+            return name[:i], name[i + 1 :].lower()
+        return name, ""
+
+    def _get_rules(self, system: str) -> "RomWalker._SystemRules":
+        """Compile the validation rules for a system once per walk."""
+        if system not in self._rules:
+            valid_ext = EmuManager().get_system_config(system).valid_ext
+            self._rules[system] = self._SystemRules(
+                frozenset(valid_ext) if valid_ext else None,
+                frozenset(ROM_DB_IGNORE_EXT),
+                tuple(ROM_DB_IGNORE_WORDS),
+            )
+        return self._rules[system]
+
+    def walk(self) -> Iterator[tuple[Path, stat_result]]:
+        """Yield the relative path and stat result of each valid ROM."""
+        self._rules = {}
+        try:
+            with os.scandir(ROM_PATH) as it:
+                systems = [
+                    entry
+                    for entry in it
+                    if not entry.name.startswith(HIDDEN_PREFIX)
+                    and entry.is_dir(follow_symlinks=False)
+                ]
+        except OSError:
+            self._logger.exception("Unable to scan ROM path %s.", ROM_PATH)
+            return
+        for entry in systems:
+            if not EmuConfigHandler.is_valid_system(entry.name):
+                self._logger.debug("Pruning invalid system %s.", entry.name)
+                continue
+            rules = self._get_rules(entry.name)
+            yield from self._walk_dir(entry.path, (entry.name,), rules)
+
+    def _walk_dir(
+        self,
+        path: str,
+        parts: tuple[str, ...],
+        rules: "RomWalker._SystemRules",
+    ) -> Iterator[tuple[Path, stat_result]]:
+        """Yield valid ROMs in a directory, then descend into subfolders."""
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            self._logger.exception("Unable to scan directory %s.", path)
+            return
+        sub_dirs: list[os.DirEntry[str]] = []
+        for entry in entries:
+            if entry.name.startswith(HIDDEN_PREFIX):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                sub_dirs.append(entry)
+            elif entry.is_file() and rules.accepts(entry.name):
+                yield Path(*parts, entry.name), entry.stat()
+        for entry in sub_dirs:
+            yield from self._walk_dir(entry.path, (*parts, entry.name), rules)
@@ -1,24 +1,40 @@
 """CacheManager module for managing ROM caching operations."""
 
-from collections.abc import Mapping
-from contextlib import suppress
-from dataclasses import dataclass
+import hashlib
+import marshal
+import os
+from collections.abc import Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field
+from functools import cache
 from pathlib import Path
 
-from apsw import Connection, Cursor
+from apsw import Connection, Cursor, SQLError
 from data.model.launchable_detail import LaunchableDetail, LaunchableType
+from data.model.name_format import NameFormat
+from shared.app_config import AppConfig
 from shared.classes.class_singleton import ClassSingleton
 from shared.constants import (
     APP_NAME,
     ARCADE_NAMING_SYSTEMS,
+    CACHE_DB_ANALYSIS_LIMIT,
+    CACHE_DB_PAGE_SIZE,
+    CACHE_DB_REBUILD_RATIO,
+    CACHE_DB_SIDECAR_SUFFIXES,
+    CACHE_DB_TEMP_EXT,
+    CACHE_DB_WORKERS,
     EMU_PATH,
+    IMG_PATH,
     ROM_PATH,
     TSP_CACHE_DB_SUFFIX,
 )
 
-RESET_TABLE = """
-    DROP TABLE IF EXISTS %s;
-    CREATE TABLE IF NOT EXISTS %s (
+CacheRow = tuple[str, str, str, int, str, str, str, str]
+NameRow = tuple[str, str, str]
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS %s_roms (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         disp TEXT NOT NULL,
         path TEXT NOT NULL,
@@ -37,175 +53,461 @@ INSERT_STATEMENT = """
     VALUES (?, ?, ?, ?, ?, ?, ?, ?)
 """
 
+SELECT_ROWS = """
+    SELECT id, disp, path, imgpath, type, ppath, pinyin, cpinyin, opinyin
+    FROM %s_roms
+"""
+
+UPDATE_STATEMENT = """
+    UPDATE %s_roms SET
+        disp = ?, path = ?, imgpath = ?, type = ?, ppath = ?, pinyin = ?,
+        cpinyin = ?, opinyin = ?
+    WHERE id = ?
+"""
+DELETE_STATEMENT = "DELETE FROM %s_roms WHERE id = ?"
+
+CREATE_HASH_TABLE = """
+    CREATE TABLE IF NOT EXISTS aroma_hash (
+        name TEXT PRIMARY KEY NOT NULL,
+        hash TEXT NOT NULL
+    )
+"""
+SELECT_HASH = "SELECT hash FROM aroma_hash WHERE name = ?"
+UPSERT_HASH = "INSERT OR REPLACE INTO aroma_hash (name, hash) VALUES (?, ?)"
+DELETE_HASH = "DELETE FROM aroma_hash WHERE name = ?"
+
+CREATE_INDEXES = """
+    CREATE INDEX IF NOT EXISTS %(parent)s_roms_ppath
+        ON %(parent)s_roms (ppath, type, disp);
+    CREATE INDEX IF NOT EXISTS %(parent)s_roms_path ON %(parent)s_roms (path);
+    PRAGMA analysis_limit = %(limit)d;
+    ANALYZE %(parent)s_roms;
+"""
+DROP_INDEXES = """
+    DROP INDEX IF EXISTS %(parent)s_roms_ppath;
+    DROP INDEX IF EXISTS %(parent)s_roms_path;
+"""
+
+SELECT_TABLES = "SELECT name FROM sqlite_master WHERE type = 'table'"
+REPLACEABLE_TABLES = {
+    "aroma_hash",
+    "sqlite_sequence",
+    "sqlite_stat1",
+    "sqlite_stat4",
+}
+
+BULK_PRAGMAS = f"""
+    PRAGMA page_size = {CACHE_DB_PAGE_SIZE};
+    PRAGMA journal_mode = OFF;
+    PRAGMA synchronous = OFF;
+"""
+
+SELECT_ROM_IDS = "SELECT path, id FROM %s_roms WHERE type = 0"
+
+UPDATE_NAME_STATEMENT = """
+    UPDATE %s_roms SET disp = ?, pinyin = ?, cpinyin = ?, opinyin = ?
+    WHERE id = ?
+"""
+
 
 class CacheManager(ClassSingleton):
     """Manage caching operations for ROM data."""
 
     @dataclass
-    class _RowEntry:  # pylint: disable=too-many-instance-attributes
-        """Represents a single entry for ROM or directory details."""
-
-        raw_path: Path
-        _name: str
-        _is_dir: bool = False
-        _launchable_item: LaunchableDetail | None = None
-        is_valid_dir: bool = False
-        _ignore_ancestors: int | None = None
-
-        def __post_init__(self) -> None:
-            with suppress(ValueError):
-                self._ignore_ancestors = self.raw_path.parts.index("Roms") + 1
-                if self.raw_path.is_relative_to(ROM_PATH):
-                    self._ignore_ancestors += 1
-            if (
-                self._is_dir
-                and self._ignore_ancestors
-                and self.raw_path.parts[self._ignore_ancestors :]
-            ):
-                self.is_valid_dir = True
-
-        def _is_arcade_rom(self) -> bool:
-            """TODO."""
-            return (
-                self._launchable_item is not None
-                and self._launchable_item.item_type == LaunchableType.ROM
-                and self._launchable_item.parent in ARCADE_NAMING_SYSTEMS
-            )
+    class _TableDiff:
+        """Holds the row changes required to bring a cache table up to date."""
 
-        @property
-        def display_name(self) -> str:
-            """Return the display name of the ROM or directory."""
-            if self._is_dir:
-                return self._get_dir_string()
-            if self._is_arcade_rom():
-                return f"{self._name} "
-            return self._name
-
-        def _get_dir_string(self, *, exclude_self: bool = False) -> str:
-            """TODO."""
-            if not self._ignore_ancestors:
-                return "."
-            if exclude_self:
-                return (
-                    ">".join(self.raw_path.parts[self._ignore_ancestors : -1])
-                    or "."
-                )
-            return (
-                ">".join(self.raw_path.parts[self._ignore_ancestors :]) or "."
-            )
-
-        @property
-        def rom_path(self) -> str:
-            """Return the ROM file path."""
-            if (
-                self._launchable_item is None
-                or self._launchable_item.item_type == LaunchableType.SHORTCUT
-            ):
-                return str(self.raw_path)
-            return str(
-                EMU_PATH
-                / self._launchable_item.parent
-                / ".."
-                / ".."
-                / "Roms"
-                / self._launchable_item.item_path
-            )
+        inserts: list[CacheRow] = field(default_factory=list)
+        updates: list[tuple[object, ...]] = field(default_factory=list)
+        deletes: list[tuple[int]] = field(default_factory=list)
 
-        @property
-        def img_path(self) -> str:
-            """Return the image path for the ROM or directory."""
-            if self._is_dir or not self._launchable_item:
-                return str(self.raw_path / "_root.png")
-            return str(self._launchable_item.get_image_path())
+        def __len__(self) -> int:
+            return len(self.inserts) + len(self.updates) + len(self.deletes)
 
-        @property
-        def type(self) -> int:
-            """Return the type, 1 for directory, 0 for ROM."""
-            return 1 if self._is_dir else 0
+    @dataclass(slots=True)
+    class _RomRow:
+        """Represents the cache row of a single ROM."""
 
-        @property
-        def parent_path(self) -> str:
-            """Return the parent directory path."""
-            return self._get_dir_string(exclude_self=True)
+        name: str
+        path: str
+        img_path: str
+        parent_path: str
+        opinyin: str
 
-        def to_db_tuple(self) -> tuple[str, str, str, int, str, str, str, str]:
+        def to_db_tuple(self) -> CacheRow:
             """Generate a tuple for database insertion."""
             return (
-                self.display_name,
-                self.rom_path,
+                self.name,
+                self.path,
                 self.img_path,
-                self.type,
+                0,
                 self.parent_path,
-                "" if self._is_dir else self.display_name,
-                "" if self._is_dir else self.display_name,
-                "" if self._is_dir else self.opinyin,
+                self.name,
+                self.name,
+                self.opinyin,
             )
 
-        @property
-        def opinyin(self) -> str:
-            """Return the pinyin value for the ROM or directory."""
-            if self._is_arcade_rom():
-                return f"{APP_NAME}_{self.raw_path.stem}"
-            return self.display_name
+    @dataclass(slots=True)
+    class _DirNode:
+        """Represents a folder in the directory trie of a system."""
+
+        path: str
+        display: str = ""
+        children: dict[str, "CacheManager._DirNode"] = field(
+            default_factory=dict
+        )
+
+        def add(self, name: str, *, visible: bool) -> "CacheManager._DirNode":
+            """Return the child folder with a name, creating it if needed."""
+            if (node := self.children.get(name)) is None:
+                node = CacheManager._DirNode(f"{self.path}{os.sep}{name}")
+                if visible:
+                    node.display = (
+                        f"{self.display}>{name}" if self.display else name
+                    )
+                self.children[name] = node
+            return node
+
+        def rows(self) -> Iterator[CacheRow]:
+            """Yield a row for every visible folder below, in path order."""
+            for name in sorted(self.children):
+                node = self.children[name]
+                if node.display:
+                    yield (
+                        node.display,
+                        node.path,
+                        f"{node.path}{os.sep}_root.png",
+                        1,
+                        self.display or ".",
+                        "",
+                        "",
+                        "",
+                    )
+                yield from node.rows()
+
+    @dataclass(slots=True)
+    class _SystemRows:
+        """Collects the ROM rows and folder trie of a single system."""
+
+        roms: list["CacheManager._RomRow"] = field(default_factory=list)
+        roots: dict[Path, "CacheManager._DirNode"] = field(
+            default_factory=dict
+        )
+
+        def folder(
+            self, base_path: Path, parts: Sequence[str]
+        ) -> "CacheManager._DirNode":
+            """Return the trie node of a folder below a base path."""
+            if (node := self.roots.get(base_path)) is None:
+                node = CacheManager._DirNode(str(base_path))
+                self.roots[base_path] = node
+            skip = CacheManager._system_depth(base_path)
+            for depth, part in enumerate(parts, 1):
+                node = node.add(
+                    part, visible=skip is not None and depth > skip
+                )
+            return node
+
+        def to_db_tuples(self) -> list[CacheRow]:
+            """Generate the ROM rows followed by the folder rows."""
+            rows = [rom.to_db_tuple() for rom in self.roms]
+            for root in self.roots.values():
+                rows.extend(root.rows())
+            return rows
+
+    @staticmethod
+    @cache
+    def _system_depth(base_path: Path) -> int | None:
+        """Return how many item path folders form the system folder."""
+        if "Roms" not in base_path.parts:
+            return None
+        depth = base_path.parts.index("Roms") + 1 - len(base_path.parts)
+        return depth + 1 if base_path.is_relative_to(ROM_PATH) else depth
+
+    @staticmethod
+    @cache
+    def _rom_prefix(parent: str) -> str:
+        """Return the path prefix the frontend uses to launch a ROM."""
+        return str(EMU_PATH / parent / ".." / ".." / "Roms")
 
     @staticmethod
-    def _replace_table(cursor: Cursor, parent: str) -> None:
-        """Drop and recreate the cache table for a system."""
-        table_name = f"{parent}_roms"
-        statement = RESET_TABLE % (table_name, table_name)
-        cursor.execute(statement)
+    @cache
+    def _image_prefix(parent: str) -> str:
+        """Return the image folder path of a system."""
+        return str(IMG_PATH / parent)
 
     @staticmethod
-    def _generate_rows(
+    def _stem(name: str) -> str:
+        """Return a file name without its suffix, as Path.stem would."""
+        i = name.rfind(".")
+        return name[:i] if 0 < i < len(name) - 1 else name
+
+    @staticmethod
+    def _content_hash(rows: list[CacheRow]) -> str:
+        """Return a fingerprint of a table's generated rows and indexing."""
+        # Version 0 writes no object references or interning flags, so equal
+        # rows always serialize to the same bytes.
+        data = marshal.dumps((AppConfig().cache_db_indexes, rows), 0)
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    @staticmethod
+    def _is_unchanged(cursor: Cursor, parent: str, content_hash: str) -> bool:
+        """Check if a cache table was last written from the same rows."""
+        stored = cursor.execute(SELECT_HASH, (parent,)).fetchone()
+        return stored is not None and stored[0] == content_hash
+
+    @staticmethod
+    def _diff_rows(
+        cursor: Cursor, parent: str, rows: list[CacheRow]
+    ) -> "CacheManager._TableDiff":
+        """Compare a cache table with the generated rows by path."""
+        diff = CacheManager._TableDiff()
+        existing: dict[str, tuple[int, tuple[object, ...]]] = {}
+        for row_id, *values in cursor.execute(SELECT_ROWS % parent):
+            if values[1] in existing:
+                diff.deletes.append((row_id,))
+                continue
+            existing[values[1]] = (row_id, tuple(values))
+        for row in rows:
+            if (current := existing.pop(row[1], None)) is None:
+                diff.inserts.append(row)
+            elif current[1] != row:
+                diff.updates.append((*row, current[0]))
+        diff.deletes.extend((row_id,) for row_id, _ in existing.values())
+        return diff
+
+    @staticmethod
+    def _index_table(cursor: Cursor, parent: str) -> None:
+        """Create or drop the indexes used by frontend folder queries."""
+        params = {"parent": parent, "limit": CACHE_DB_ANALYSIS_LIMIT}
+        if AppConfig().cache_db_indexes:
+            cursor.execute(CREATE_INDEXES % params).fetchall()
+        else:
+            cursor.execute(DROP_INDEXES % params)
+
+    @staticmethod
+    def _update_table(
+        cursor: Cursor, parent: str, rows: list[CacheRow], content_hash: str
+    ) -> bool:
+        """Apply row changes in place, unless a rebuild is preferable."""
+        logger = CacheManager.get_static_logger()
+        table = f"{parent}_roms"
+        tables = {name for (name,) in cursor.execute(SELECT_TABLES)}
+        replaceable = tables <= REPLACEABLE_TABLES | {table}
+        if table not in tables:
+            if replaceable:
+                return False
+            diff = CacheManager._TableDiff(inserts=rows)
+        elif "aroma_hash" in tables and CacheManager._is_unchanged(
+            cursor, parent, content_hash
+        ):
+            logger.info("Cache for %s is unchanged.", parent)
+            return True
+        else:
+            diff = CacheManager._diff_rows(cursor, parent, rows)
+            if replaceable and len(diff) > len(rows) * CACHE_DB_REBUILD_RATIO:
+                return False
+        cursor.execute(CREATE_TABLE % parent)
+        cursor.execute(CREATE_HASH_TABLE)
+        cursor.executemany(DELETE_STATEMENT % parent, diff.deletes)
+        cursor.executemany(UPDATE_STATEMENT % parent, diff.updates)
+        cursor.executemany(INSERT_STATEMENT % parent, diff.inserts)
+        CacheManager._index_table(cursor, parent)
+        cursor.execute(UPSERT_HASH, (parent, content_hash))
+        logger.info(
+            "Updated cache for %s: %d inserted, %d updated, %d deleted.",
+            parent,
+            len(diff.inserts),
+            len(diff.updates),
+            len(diff.deletes),
+        )
+        return True
+
+    @staticmethod
+    def _replace_db(temp_db: Path, cache_db: Path) -> None:
+        """Durably swap a built database in place of the original."""
+        with temp_db.open("rb+") as f:
+            os.fsync(f.fileno())
+        for suffix in CACHE_DB_SIDECAR_SUFFIXES:
+            Path(f"{cache_db}{suffix}").unlink(missing_ok=True)
+        temp_db.replace(cache_db)
+        if hasattr(os, "O_DIRECTORY"):
+            fd = os.open(cache_db.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    @staticmethod
+    def _build_table(
+        cache_db: Path, parent: str, rows: list[CacheRow], content_hash: str
+    ) -> None:
+        """Build a cache database in a temporary file, then swap it in."""
+        temp_db = cache_db.with_suffix(CACHE_DB_TEMP_EXT)
+        temp_db.unlink(missing_ok=True)
+        with closing(Connection(str(temp_db))) as conn:
+            cursor = conn.cursor()
+            cursor.execute(BULK_PRAGMAS).fetchall()
+            with conn:
+                cursor.execute(CREATE_TABLE % parent)
+                cursor.execute(CREATE_HASH_TABLE)
+                cursor.executemany(INSERT_STATEMENT % parent, rows)
+                CacheManager._index_table(cursor, parent)
+                cursor.execute(UPSERT_HASH, (parent, content_hash))
+        CacheManager._replace_db(temp_db, cache_db)
+        CacheManager.get_static_logger().info(
+            "Built cache for %s with %d rows.", parent, len(rows)
+        )
+
+    @staticmethod
+    def _update_system(
+        cache_db: Path, parent: str, rows: list[CacheRow]
+    ) -> None:
+        """Update the cache database of a single system."""
+        content_hash = CacheManager._content_hash(rows)
+        if cache_db.is_file():
+            with closing(Connection(str(cache_db))) as conn, conn:
+                if CacheManager._update_table(
+                    conn.cursor(), parent, rows, content_hash
+                ):
+                    return
+        CacheManager._build_table(cache_db, parent, rows, content_hash)
+
+    @staticmethod
+    def _get_cache_db(base_path: Path, parent: str) -> Path:
+        """Return the path of the cache database for a system."""
+        return base_path / parent / f"{Path(parent).name}{TSP_CACHE_DB_SUFFIX}"
+
+    @staticmethod
+    def _generate_launchable_rows(
         launchables: Mapping[str, LaunchableDetail],
-    ) -> dict[str, list["CacheManager._RowEntry"]]:
-        """Generate row entries for ROMs and directories."""
-        parent_dict: dict[str, list[CacheManager._RowEntry]] = {}
+    ) -> dict[str, "CacheManager._SystemRows"]:
+        """Generate ROM rows and folder tries, grouped by system."""
+        systems: dict[str, CacheManager._SystemRows] = {}
+        name_format = NameFormat.compile(AppConfig().name_format)
         for launchable in launchables.values():
-            CacheManager._add_launchable_entry(parent_dict, launchable)
-        for parent, rows in parent_dict.items():
-            CacheManager._add_directory_entries(parent_dict, parent, rows)
-        return parent_dict
+            if (system := systems.get(launchable.parent)) is None:
+                system = CacheManager._SystemRows()
+                systems[launchable.parent] = system
+            CacheManager._add_launchable_entry(system, launchable, name_format)
+        return systems
+
+    @staticmethod
+    def _item_parts(launchable: LaunchableDetail) -> list[str]:
+        """Split the item path of a ROM on either separator."""
+        return launchable.item_path.replace(os.sep, "/").split("/")
+
+    @staticmethod
+    def _rom_path(launchable: LaunchableDetail, parts: list[str]) -> str:
+        """Return the path the frontend stores for a ROM."""
+        if launchable.item_type == LaunchableType.SHORTCUT:
+            prefix = str(launchable.base_path)
+        else:
+            prefix = CacheManager._rom_prefix(launchable.parent)
+        return f"{prefix}{os.sep}{os.sep.join(parts)}"  # noqa: PTH118
+
+    @staticmethod
+    def _rom_names(
+        launchable: LaunchableDetail, stem: str, name_format: NameFormat
+    ) -> tuple[str, str]:
+        """Return the display name and original name column of a ROM."""
+        name = launchable.format_name(name_format)
+        if (
+            launchable.item_type != LaunchableType.SHORTCUT
+            and launchable.parent in ARCADE_NAMING_SYSTEMS
+        ):
+            return f"{name} ", f"{APP_NAME}_{stem}"
+        return name, name
 
     @staticmethod
     def _add_launchable_entry(
-        parent_dict: dict[str, list["CacheManager._RowEntry"]],
+        system: "CacheManager._SystemRows",
         launchable: LaunchableDetail,
+        name_format: NameFormat,
     ) -> None:
-        """Add a ROM entry to the system dictionary."""
-        row_entry = CacheManager._RowEntry(
-            launchable.full_path,
-            launchable.format_name(),
-            _launchable_item=launchable,
+        """Add a ROM row and its folders to a system."""
+        parts = CacheManager._item_parts(launchable)
+        folder = system.folder(launchable.base_path, parts[:-1])
+        stem = CacheManager._stem(parts[-1])
+        name, opinyin = CacheManager._rom_names(launchable, stem, name_format)
+        system.roms.append(
+            CacheManager._RomRow(
+                name,
+                CacheManager._rom_path(launchable, parts),
+                f"{CacheManager._image_prefix(launchable.parent)}"
+                f"{os.sep}{stem}.png",
+                folder.display or ".",
+                opinyin,
+            )
         )
-        parent_dict.setdefault(launchable.parent, []).append(row_entry)
 
     @staticmethod
-    def _add_directory_entries(
-        parent_dict: dict[str, list["CacheManager._RowEntry"]],
-        parent: str,
-        rows: list["CacheManager._RowEntry"],
-    ) -> None:
-        """Add directory entries to the system dictionary."""
-        dirs = {ancestor for r in rows for ancestor in r.raw_path.parents}
-        for i in sorted(dirs):
-            dir_entry = CacheManager._RowEntry(i, i.name, _is_dir=True)
-            if dir_entry.is_valid_dir:
-                parent_dict.setdefault(parent, []).append(dir_entry)
+    def _generate_name_rows(
+        launchables: Mapping[str, LaunchableDetail],
+    ) -> dict[str, list[NameRow]]:
+        """Generate the path and names of every ROM, grouped by system."""
+        systems: dict[str, list[NameRow]] = {}
+        name_format = NameFormat.compile(AppConfig().name_format)
+        for launchable in launchables.values():
+            parts = CacheManager._item_parts(launchable)
+            stem = CacheManager._stem(parts[-1])
+            systems.setdefault(launchable.parent, []).append(
+                (
+                    CacheManager._rom_path(launchable, parts),
+                    *CacheManager._rom_names(launchable, stem, name_format),
+                )
+            )
+        return systems
 
     @staticmethod
     def update_cache_db(
         launchables: Mapping[str, LaunchableDetail], base_path: Path
     ) -> None:
         """Update the cache database with ROM and directory entries."""
-        for parent, rows in CacheManager._generate_rows(launchables).items():
+        systems = CacheManager._generate_launchable_rows(launchables)
+        with ThreadPoolExecutor(max_workers=CACHE_DB_WORKERS) as executor:
+            futures = [
+                executor.submit(
+                    CacheManager._update_system,
+                    CacheManager._get_cache_db(base_path, parent),
+                    Path(parent).name,
+                    system.to_db_tuples(),
+                )
+                for parent, system in systems.items()
+            ]
+            for future in futures:
+                future.result()
+
+    @staticmethod
+    def rename_cache_db(
+        launchables: Mapping[str, LaunchableDetail], base_path: Path
+    ) -> None:
+        """Update only the display names of ROM entries in the cache."""
+        logger = CacheManager.get_static_logger()
+        systems = CacheManager._generate_name_rows(launchables)
+        for parent, rows in systems.items():
             base_parent = Path(parent).name
-            cache_db = (
-                base_path / parent / f"{base_parent}{TSP_CACHE_DB_SUFFIX}"
-            )
-            with Connection(str(cache_db)) as conn:
+            cache_db = CacheManager._get_cache_db(base_path, parent)
+            if not cache_db.is_file():
+                logger.warning("Cache database %s not found.", cache_db)
+                continue
+            with closing(Connection(str(cache_db))) as conn, conn:
                 cursor = conn.cursor()
-                CacheManager._replace_table(cursor, base_parent)
-                data_to_insert = [entry.to_db_tuple() for entry in rows]
-                statement = INSERT_STATEMENT % base_parent
-                cursor.executemany(statement, data_to_insert)
+                try:
+                    row_ids: dict[str, int] = dict(
+                        cursor.execute(SELECT_ROM_IDS % base_parent)
+                    )
+                except SQLError:
+                    logger.warning("Cache table for %s not found.", parent)
+                    continue
+                updates = [
+                    (name, name, name, opinyin, row_id)
+                    for path, name, opinyin in rows
+                    if (row_id := row_ids.get(path)) is not None
+                ]
+                cursor.execute(CREATE_HASH_TABLE)
+                cursor.execute(DELETE_HASH, (base_parent,))
+                cursor.executemany(
+                    UPDATE_NAME_STATEMENT % base_parent, updates
+                )
+            logger.info("Renamed %d ROMs in %s.", len(updates), cache_db)
@@ -3,58 +3,66 @@
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from data.model.media_item import MediaItem
+from data.model.media_target import MediaTarget
 from data.model.rom_detail import RomDetail
 from data.parser.filename_parser import FilenameParser
 from data.source.screen_scraper_api import ScreenScraperAPI
+from data.tools.lookup_planner import Lookup, LookupPlanner
 from shared.app_config import AppConfig
 from shared.classes.class_singleton import ClassSingleton
 from shared.constants import (
     ARCADE_NAMING_SYSTEMS,
     CONSOLE_ID_METHOD,
-    IMG_PATH,
     SCRAPER_LOG_RESOURCE,
+    SCRAPER_LOOKUP_BUDGET,
+    SCRAPER_LOOKUP_QUOTA_RESERVE,
     SCRAPER_REGION_TREE,
     SCRAPER_SYSTEM_MAP,
 )
 from shared.tools import util
 
 if TYPE_CHECKING:
-    from collections.abc import Awaitable
+    from collections.abc import Awaitable, Callable
 
 
 class ImageManager(ClassSingleton):
     """Manages image files associated with ROMs."""
 
-    RATE_LIMIT = 50
-    CONNECTION_LIMIT = 50
-
     @staticmethod
     def remove_broken_images(rom_db: dict[str, RomDetail]) -> None:
         """Remove images not associated with valid ROM paths."""
+        targets = MediaTarget.from_config()
         valid_images: set[Path] = {
-            rom.get_image_path() for rom in rom_db.values()
+            target.image_path(rom)
+            for rom in rom_db.values()
+            for target in targets
         }
-        for path in IMG_PATH.rglob("*.png"):
-            if path in valid_images:
+        roots = {target.path for target in targets}
+        for root in roots:
+            if any(root != r and root.is_relative_to(r) for r in roots):
                 continue
-            util.delete_file(path)
-            ImageManager.get_static_logger().info(
-                "Deleted broken image: %s", path
-            )
+            for path in root.rglob("*.png"):
+                if path in valid_images:
+                    continue
+                util.delete_file(path)
+                ImageManager.get_static_logger().info(
+                    "Deleted broken image: %s", path
+                )
 
     @staticmethod
     def _get_unscraped_image_paths(
-        rom_db: dict[str, RomDetail],
+        rom_db: dict[str, RomDetail], targets: tuple[MediaTarget, ...]
     ) -> dict[Path, RomDetail]:
-        """Get paths of images that have not been scraped."""
+        """Get paths of images where any media target has not been scraped."""
         return {
-            img_path: rom
+            rom.get_image_path(): rom
             for rom in rom_db.values()
-            if (img_path := rom.get_image_path()) and not img_path.is_file()
+            if any(not target.image_path(rom).is_file() for target in targets)
         }
 
     @staticmethod
@@ -69,9 +77,9 @@ class ImageManager(ClassSingleton):
     @staticmethod
     def _fetch_and_save_image(url: str, save_path: Path) -> None:
         """Fetch an image and save it to the provided path."""
-        if response := ScreenScraperAPI.get(url):
+        if content := ScreenScraperAPI().download(url):
             with save_path.open(mode="wb") as f:
-                f.write(response.content)
+                f.write(content)
 
     @staticmethod
     async def _download_image(
@@ -85,46 +93,114 @@ class ImageManager(ClassSingleton):
         )
 
     @staticmethod
-    async def _fetch_image_data(  # pylint: disable=too-complex
+    def _get_lookups(
         scraper: ScreenScraperAPI,
         path: Path,
         rom: RomDetail,
         region_priority: dict[str, int],
-        executor: ThreadPoolExecutor,
-    ) -> list[MediaItem] | None:
-        """Fetch image data for the given ROM asynchronously."""
-        system_id = SCRAPER_SYSTEM_MAP.get(system := path.parts[0], None)
-        result: list[MediaItem] | None = None
-
-        async def name_search(
-            name: str, *, exc_system: bool = False
-        ) -> list[MediaItem] | None:
-            """Fetch media items by name."""
-            return await asyncio.get_event_loop().run_in_executor(
-                executor,
+    ) -> list[Lookup]:
+        """Get the media lookups for the given ROM in priority order."""
+        system_id = SCRAPER_SYSTEM_MAP.get(system := rom.parent, None)
+
+        def name_search(
+            strategy: str, name: str, *, exc_system: bool = False
+        ) -> Lookup:
+            """Create a lookup of media items by name."""
+            return Lookup(
+                strategy,
                 lambda: scraper.get_game_media_by_name(
                     name, None if exc_system else system_id, region_priority
                 ),
             )
 
+        if system in ARCADE_NAMING_SYSTEMS:
+            return [
+                name_search("zip_name", path.with_suffix(".zip").name),
+                name_search("name", rom.name_clean),
+            ]
+        lookups: list[Lookup] = []
         if rom.id_method == CONSOLE_ID_METHOD:
-            result = await asyncio.get_event_loop().run_in_executor(
-                executor,
-                lambda: scraper.get_game_media_by_crc(rom.id, region_priority),
+            lookups.append(
+                Lookup(
+                    "crc",
+                    lambda: scraper.get_game_media_by_crc(
+                        rom.full_id, region_priority
+                    ),
+                )
             )
-        if system in ARCADE_NAMING_SYSTEMS:
-            result = await name_search(path.with_suffix(".zip").name)
-        if not result:
-            result = await name_search(rom.name_clean)
-        if not result and system not in ARCADE_NAMING_SYSTEMS:
-            parse_filename = FilenameParser().parse(path)
-            result = await name_search(parse_filename.name_clean)
-        if not result and system in {"PORTS"}:
-            parse_filename = FilenameParser().parse(path)
-            result = await name_search(
-                parse_filename.name_clean, exc_system=True
+        lookups.append(name_search("name", rom.name_clean))
+        name_clean = FilenameParser().parse(path).name_clean
+        if name_clean != rom.name_clean:
+            lookups.append(name_search("filename", name_clean))
+        if system in {"PORTS"}:
+            lookups.append(
+                name_search("any_system", name_clean, exc_system=True)
             )
-        return result
+        return lookups
+
+    @staticmethod
+    def _serve_targets(
+        fetch: "Callable[[], list[MediaItem] | None]",
+        targets: list[MediaTarget],
+        fallbacks: dict[int, list[MediaItem]],
+        index: int,
+    ) -> list[MediaItem] | None:
+        """Run a lookup, finding nothing unless it serves the first target.
+
+        Media serving only the later targets is kept in the fallbacks.
+        """
+        if (result := fetch()) is None or targets[0].select(result):
+            return result
+        if any(target.select(result) for target in targets[1:]):
+            fallbacks[index] = result
+        return []
+
+    @staticmethod
+    async def _fetch_image_data(
+        path: Path,
+        rom: RomDetail,
+        targets: list[MediaTarget],
+        region_priority: dict[str, int],
+        executor: ThreadPoolExecutor,
+    ) -> tuple[list[MediaItem], bool]:
+        """Fetch the media serving most targets, and if every lookup ran.
+
+        Media for the first target is preferred. Without it, the lookup
+        serving the most other targets is used, in priority order.
+        """
+        scraper = ScreenScraperAPI()
+        fallbacks: dict[int, list[MediaItem]] = {}
+        lookups = [
+            Lookup(
+                lookup.strategy,
+                partial(
+                    ImageManager._serve_targets,
+                    lookup.fetch,
+                    targets,
+                    fallbacks,
+                    i,
+                ),
+            )
+            for i, lookup in enumerate(
+                ImageManager._get_lookups(scraper, path, rom, region_priority)
+            )
+        ]
+        budget = min(SCRAPER_LOOKUP_BUDGET, scraper.limiter.concurrency)
+        if scraper.quota.is_low(SCRAPER_LOOKUP_QUOTA_RESERVE):
+            budget = 1
+        result = await LookupPlanner().resolve(
+            rom.parent, lookups, executor, budget
+        )
+        if result or not fallbacks:
+            return result or [], result is not None
+        _, media = max(
+            fallbacks.items(),
+            key=lambda item: (
+                sum(target.select(item[1]) is not None for target in targets),
+                -item[0],
+            ),
+        )
+        return media, result is not None
 
     @staticmethod
     async def _scrape_image(
@@ -133,28 +209,55 @@ class ImageManager(ClassSingleton):
         region_priority: dict[str, int],
         semaphore: asyncio.Semaphore,
         executor: ThreadPoolExecutor,
-    ) -> tuple[Path, bool]:
-        """Scrape an image associated with a given ROM asynchronously."""
+    ) -> tuple[Path, bool | None]:
+        """Scrape the images of every media target for a ROM asynchronously."""
         async with semaphore:
-            await asyncio.sleep(1 / ImageManager.RATE_LIMIT)
             scraper = ScreenScraperAPI()
-            result = await ImageManager._fetch_image_data(
-                scraper, path, rom, region_priority, executor
+            if scraper.limiter.stopped:
+                return path, None
+            missing = [
+                (target, save_path)
+                for target in MediaTarget.from_config()
+                if not (save_path := target.image_path(rom)).is_file()
+            ]
+            if not missing:
+                return path, True
+            media, complete = await ImageManager._fetch_image_data(
+                path,
+                rom,
+                [target for target, _ in missing],
+                region_priority,
+                executor,
             )
-            if result:
-                await ImageManager._download_image(
-                    result[0].url, IMG_PATH / path, executor
+            await asyncio.gather(
+                *(
+                    ImageManager._download_image(item.url, save_path, executor)
+                    for target, save_path in missing
+                    if (item := target.select(media))
                 )
-                if (IMG_PATH / path).is_file():
-                    ImageManager.get_static_logger().debug("Scraped: %s", path)
-                    return path, True
-            ImageManager.get_static_logger().info("Failed Scrape: %s", path)
+            )
+            failed = [str(p) for _, p in missing if not p.is_file()]
+            if not failed:
+                ImageManager.get_static_logger().debug("Scraped: %s", path)
+                return path, True
+            if scraper.limiter.stopped:
+                return path, None
+            if not complete:
+                ImageManager.get_static_logger().info(
+                    "Deferred Scrape: %s", ", ".join(failed)
+                )
+                return path, None
+            ImageManager.get_static_logger().info(
+                "Failed Scrape: %s", ", ".join(failed)
+            )
             return path, False
 
     @staticmethod
     async def _scrape_missing_images(rom_db: dict[str, RomDetail]) -> None:
         """Scrape missing images for ROMs in the database asynchronously."""
-        missing = ImageManager._get_unscraped_image_paths(rom_db)
+        missing = ImageManager._get_unscraped_image_paths(
+            rom_db, MediaTarget.from_config()
+        )
         scraper_log = ImageManager._load_scraper_log(missing)
 
         region_priority = {
@@ -163,23 +266,38 @@ class ImageManager(ClassSingleton):
                 SCRAPER_REGION_TREE[AppConfig().scrape_preferred_region]
             )
         }
-        semaphore = asyncio.Semaphore(ImageManager.CONNECTION_LIMIT)
-        tasks: list[Awaitable[tuple[Path, bool]]] = []
+        scraper = ScreenScraperAPI()
+        if scraper.load_quota().remaining == 0:
+            ImageManager.get_static_logger().warning(
+                "ScreenScraper daily quota reached, skipping scrape."
+            )
+            return
+        semaphore = asyncio.Semaphore(scraper.quota.max_threads)
+        planner = LookupPlanner()
+        planner.load()
+        targets: dict[Path, RomDetail] = {}
+        for path, rom in missing.items():
+            if not ImageManager._check_last_scraped(scraper_log.get(path)):
+                ImageManager.get_static_logger().info("Skip Scrape: %s", path)
+                continue
+            targets[path] = rom
+        FilenameParser().parse_many(
+            p
+            for p, rom in targets.items()
+            if rom.parent not in ARCADE_NAMING_SYSTEMS
+        )
         with ThreadPoolExecutor(
             max_workers=AppConfig().scrape_cpu_threads
         ) as executor:
-            for path, rom in missing.items():
-                if not ImageManager._check_last_scraped(scraper_log.get(path)):
-                    ImageManager.get_static_logger().info(
-                        "Skip Scrape: %s", path
-                    )
-                    continue
-                tasks.append(
-                    ImageManager._scrape_image(
-                        path, rom, region_priority, semaphore, executor
-                    )
+            tasks: list[Awaitable[tuple[Path, bool | None]]] = [
+                ImageManager._scrape_image(
+                    path, rom, region_priority, semaphore, executor
                 )
+                for path, rom in targets.items()
+            ]
             results = await asyncio.gather(*tasks)
+        scraper.save_quota()
+        planner.save()
         await ImageManager._handle_scraping_results(results, scraper_log)
 
     @staticmethod
@@ -193,10 +311,12 @@ class ImageManager(ClassSingleton):
 
     @staticmethod
     async def _handle_scraping_results(
-        results: list[tuple[Path, bool]], scraper_log: dict[Path, int]
+        results: list[tuple[Path, bool | None]], scraper_log: dict[Path, int]
     ) -> None:
         """Handle the results of the scraping operations."""
         for path, success in results:
+            if success is None:
+                continue
             if not success:
                 scraper_log[path] = util.get_datestamp()
                 continue
@@ -1,7 +1,6 @@
 """Defines the RomManager class for managing ROMs and associated resources."""
 
 from data.model.rom_detail import RomDetail
-from data.source.name_db import NameDB
 from data.source.rom_db import RomDB
 from manager.cache_manager import CacheManager
 from manager.emu_manager import EmuManager
@@ -34,6 +33,10 @@ class RomManager(ClassSingleton):
         if AppConfig().clean_emu_on_refresh:
             EmuManager().clean_emus(self._rom_db.data)
 
+    def rename_roms(self) -> None:
+        """Regenerate ROM display names in the TSP cache."""
+        CacheManager().rename_cache_db(self._rom_db.stored, ROM_PATH)
+
     def remove_broken_images(self) -> None:
         """Remove images not associated with valid ROM paths."""
         self._rom_db.update()
@@ -48,8 +51,3 @@ class RomManager(ClassSingleton):
         """Scrape and download missing images for valid ROMs."""
         self._rom_db.update()
         EmuManager().clean_emus(self._rom_db.data)
-
-    @staticmethod
-    def cleanup() -> None:
-        """TODO."""
-        NameDB().remove_db()
@@ -1,7 +1,9 @@
 # pylint: disable=too-many-arguments
 """Module for defining application configuration settings."""
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
+from typing import Any
 
 from shared.classes.json_dataclass import JsonDataClass
 
@@ -24,10 +26,15 @@ class AppConfig(JsonDataClass):  # pylint: disable=too-many-instance-attributes
     days_until_scrape_attempt: int = 7
     scrape_on_refresh: bool = False
     scrape_media_type: str = ""
+    scrape_extra_media: list[dict[str, Any]] = field(default_factory=list)
     scrape_preferred_region: str = ""
     screenscraper_userid: str = ""
     screenscraper_password: str = ""
     _scrape_cpu_threads: int = 0
+    _hash_cpu_workers: int = 0
+    hash_use_processes: bool = False
+    cache_db_indexes: bool = True
+    _name_filter_fp_rate: float = 0.01
     archive_userid: str = ""
     archive_password: str = ""
     clean_emu_on_refresh: bool = False
@@ -38,6 +45,25 @@ class AppConfig(JsonDataClass):  # pylint: disable=too-many-instance-attributes
         """Return number of CPU threads for scraping, or None if not set."""
         return w if (w := self._scrape_cpu_threads) > 0 else None
 
+    @property
+    def scrape_http_pool_size(self) -> int:
+        """Return the HTTP connection pool size for the scraping threads."""
+        if (w := self.scrape_cpu_threads) is not None:
+            return w
+        return min(32, (os.cpu_count() or 1) + 4)
+
+    @property
+    def hash_cpu_workers(self) -> int:
+        """Return number of ROM hashing workers, defaulting to CPU count."""
+        if (w := self._hash_cpu_workers) > 0:
+            return w
+        return os.cpu_count() or 1
+
+    @property
+    def name_filter_fp_rate(self) -> float:
+        """Return the names database filter's target false positive rate."""
+        return min(max(self._name_filter_fp_rate, 0.000001), 0.5)
+
     @staticmethod
     def set_db_rebuild_required(reason: str | None = None) -> None:
         """Set ROM DB rebuild required flag."""
@@ -27,6 +27,10 @@ SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 
 APP_ROM_DB_PATH = APP_PATH / "rom_db.json"
+APP_ROM_STORE_PATH = APP_PATH / "rom_db.db"
+APP_ROM_MANIFEST_PATH = APP_PATH / "rom_manifest.json"
+APP_PARSE_CACHE_PATH = APP_PATH / "parse_cache.json"
+APP_SCRAPER_CACHE_PATH = APP_PATH / "scraper_cache.db"
 
 ARCADE_NAMES_TARGET_FILE = (
     SD_PATH / "BIOS" / "arcade_lists" / "arcade-rom-names.txt"
@@ -39,9 +43,13 @@ ARCADE_LIBRARY_APP_RESOURCE = (
 NAMES_APP_RESOURCE = RESOURCES / "naming" / "names.zip"
 ARCADE_NAMES_DB = RESOURCES / "naming" / "arcade.db"
 CONSOLE_NAMES_DB = RESOURCES / "naming" / "console.db"
+NAMES_DB_STAMP_EXT = ".crc"
+NAMES_DB_FILTER_EXT = ".bloom"
+NAMES_DB_INDEX_EXT = ".fts"
 ARCADE_ID_METHOD = "file_stem"
 CONSOLE_ID_METHOD = "db_crc"
 FILE_ID_METHOD = "file_crc"
+TITLE_ID_METHOD = "db_title"
 ARCADE_NAMING_SYSTEMS = [
     "MAME2003PLUS",
     "FBNEO",
@@ -95,8 +103,31 @@ NAMING_VERSION_ID = "$v"
 NAMING_YEAR_ID = "$y"
 NAMING_ADDITIONAL_ID = "$a"
 TSP_CACHE_DB_SUFFIX = "_cache7.db"
+CACHE_DB_TEMP_EXT = ".aromatmp"
+CACHE_DB_SIDECAR_SUFFIXES = ("-journal", "-wal", "-shm")
+CACHE_DB_PAGE_SIZE = 16384
+CACHE_DB_ANALYSIS_LIMIT = 1000
+CACHE_DB_REBUILD_RATIO = 0.5
+CACHE_DB_WORKERS = 4
 
 SCRAPER_LOG_RESOURCE = RESOURCES / "scraping" / "scraper_log.json"
+SCRAPER_QUOTA_RESOURCE = RESOURCES / "scraping" / "scraper_quota.json"
+SCRAPER_LOOKUP_STATS_RESOURCE = RESOURCES / "scraping" / "lookup_stats.json"
+SCRAPER_DEFAULT_THREADS = 1
+SCRAPER_DEFAULT_REQUESTS_PER_MINUTE = 120
+SCRAPER_RECOVERY_REQUESTS = 20
+SCRAPER_CACHE_HIT_DAYS = 180
+SCRAPER_CACHE_MISS_DAYS = 30
+SCRAPER_THROTTLED_STATUS = 429
+SCRAPER_THROTTLED_RETRIES = 3
+SCRAPER_QUOTA_STATUSES = (430, 431)
+SCRAPER_LOOKUP_BUDGET = 2
+SCRAPER_LOOKUP_QUOTA_RESERVE = 0.2
+SCRAPER_LOOKUP_MIN_CHANCE = 0.25
+SCRAPER_LOOKUP_STATS_WINDOW = 200
+HTTP_RETRIES = 3
+HTTP_RETRY_BACKOFF = 0.5
+HTTP_RETRY_STATUSES = (500, 502, 503, 504)
 SCRAPER_MAX_WIDTH = 400
 SCRAPER_MAX_HEIGHT = 580
 SCRAPER_MEDIA_TYPES = [
@@ -270,6 +301,9 @@ MAX_ITEMS_PER_PAGE = 14
 STOCK_STR = "STOCK"
 CUSTOM_STR = "CUSTOM"
 
+CRC_BUFFER_SIZE = 1024 * 1024
+PARSE_CACHE_SIZE = 50000
+
 ROM_DB_IGNORE_EXT = {"srm", "sav", "db", "png"}
 ROM_DB_IGNORE_WORDS = {"\u00b0"}
 EMU_EXT_KEY = "extlist"
@@ -5,12 +5,47 @@ from __future__ import annotations
 import dataclasses
 import json
 from enum import Enum
+from functools import cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from data.custom_types.is_data_class import IsDataclass
+if TYPE_CHECKING:
+    from data.custom_types.is_data_class import IsDataclass
 
 EXCLUDE_FROM_SERIALIZATION = "exclude_from_serialization"
+SERIALIZATION_OVERRIDES = "serialization_overrides"
+
+T = TypeVar("T")
+
+
+@cache
+def serialized_fields(cls: type) -> tuple[str, ...]:
+    """Return the names of a dataclass's serialized fields, in order."""
+    return tuple(
+        f.name
+        for f in dataclasses.fields(cls)
+        if not f.metadata.get(EXCLUDE_FROM_SERIALIZATION, False)
+    )
+
+
+@cache
+def init_fields(cls: type) -> frozenset[str]:
+    """Return the names of a dataclass's constructor fields."""
+    return frozenset(f.name for f in dataclasses.fields(cls) if f.init)
+
+
+def dataclass_to_dict(o: IsDataclass) -> dict[str, Any]:
+    """Convert a dataclass to a dictionary of its non-empty fields."""
+    data = {name: getattr(o, name) for name in serialized_fields(type(o))}
+    if overrides := getattr(o, SERIALIZATION_OVERRIDES, None):
+        data.update(overrides())
+    return {k: v for k, v in data.items() if v}
+
+
+def dataclass_from_dict(cls: type[T], data: dict[str, Any]) -> T:
+    """Create a dataclass from a dictionary, ignoring unknown keys."""
+    fields = init_fields(cls)
+    return cls(**{k: v for k, v in data.items() if k in fields})
 
 
 class EnhancedJSONEncoder(json.JSONEncoder):
@@ -18,23 +53,10 @@ class EnhancedJSONEncoder(json.JSONEncoder):
 
     def default(self, o: Any) -> Any:  # noqa: ANN401
         """Convert dataclass instances to dictionaries."""
-        if isinstance(o, IsDataclass):
-            return {
-                k: v
-                for k, v in dataclasses.asdict(o).items()
-                if v and not self._is_excluded(k, o)
-            }
+        if dataclasses.is_dataclass(o) and not isinstance(o, type):
+            return dataclass_to_dict(o)
         if isinstance(o, Path):
             return str(o)
         if isinstance(o, Enum):
             return o.value
         return super().default(o)
-
-    @staticmethod
-    def _is_excluded(field_name: str, instance: IsDataclass) -> bool:
-        """Check if a field should be excluded from serialization."""
-        field_info = dataclasses.fields(instance.__class__)
-        for field in field_info:
-            if field.name == field_name:
-                return field.metadata.get(EXCLUDE_FROM_SERIALIZATION, False)
-        return False
@@ -3,9 +3,10 @@
 import binascii
 import json
 import logging
+import os
 import re
 import shutil
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from contextlib import suppress
 from dataclasses import dataclass
 from datetime import UTC, datetime
@@ -16,7 +17,13 @@ from zipfile import ZIP_LZMA, ZipFile, ZipInfo
 
 from py7zr import FileInfo, SevenZipFile
 from sdl2.ext import Color
-from shared.constants import BACKUP_EXT, RUNNING_ON_TSP, TSP_SD, WIN_SD
+from shared.constants import (
+    BACKUP_EXT,
+    CRC_BUFFER_SIZE,
+    RUNNING_ON_TSP,
+    TSP_SD,
+    WIN_SD,
+)
 from shared.tools.enhanced_json_encoder import EnhancedJSONEncoder
 
 
@@ -79,7 +86,7 @@ def extract_from_zip(
             if output_path.exists():
                 output_path.unlink()
             with zipf.open(file_name) as src, output_path.open("wb") as tar:
-                tar.write(src.read())
+                shutil.copyfileobj(src, tar, CRC_BUFFER_SIZE)
                 logging.info(
                     "Extracted %s to %s",
                     file_name,
@@ -117,6 +124,15 @@ def bytes_from_zip(
     return buffer
 
 
+def get_zip_member(zip_path: Path, file_name: str) -> ZipInfo | None:
+    """Retrieve the info of a single file in a zip archive."""
+    if not zip_path.is_file():
+        return None
+    with ZipFile(zip_path, "r") as archive, suppress(KeyError):
+        return archive.getinfo(file_name)
+    return None
+
+
 def get_zip_info(
     zip_path: Path,
 ) -> list[FileCrc]:
@@ -152,13 +168,32 @@ def get_archive_info(
     return []
 
 
-def check_crc(data: Path | bytes) -> str:
+def _advise_sequential(fd: int) -> None:
+    """Hint to the kernel that a file will be read sequentially."""
+    if hasattr(os, "posix_fadvise"):
+        with suppress(OSError):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
+def _stream_crc(path: Path, buffer_size: int) -> int:
+    """Calculate the CRC32 of a file using a fixed size read buffer."""
+    crc = 0
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with path.open("rb", buffering=0) as f:
+        _advise_sequential(f.fileno())
+        while size := f.readinto(buffer):
+            crc = binascii.crc32(view[:size], crc)
+    return crc
+
+
+def check_crc(data: Path | bytes, buffer_size: int = CRC_BUFFER_SIZE) -> str:
     """Calculate and returns the CRC32 checksum of a file."""
     logging.debug("Calculating CRC32 checksum for file: %s", data)
     if isinstance(data, Path):
-        with data.open("rb") as f:  # pylint: disable=unspecified-encoding
-            data = f.read()
-    crc: int = binascii.crc32(data) & 0xFFFFFFFF
+        crc: int = _stream_crc(data, buffer_size) & 0xFFFFFFFF
+    else:
+        crc = binascii.crc32(data) & 0xFFFFFFFF
     logging.debug("CRC32 checksum: %s", crc)
     return f"{crc:08x}"
 
@@ -243,6 +278,28 @@ def save_simple_json(
         logging.exception("Error while saving JSON data")
 
 
+def stream_json(
+    items: Iterable[tuple[str, Any]],
+    path: Path,
+    *,
+    ensure_ascii: bool = False,
+) -> None:
+    """Write key value pairs as an indented JSON object, one at a time."""
+    encoder = EnhancedJSONEncoder(ensure_ascii=ensure_ascii, indent=4)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with path.open("w", encoding="utf8") as file:
+            file.write("{")
+            count = 0
+            for count, (key, value) in enumerate(items, 1):
+                file.write(",\n    " if count > 1 else "\n    ")
+                file.write(f"{encoder.encode(key)}: ")
+                file.write(encoder.encode(value).replace("\n", "\n    "))
+            file.write("\n}" if count else "}")
+    except (OSError, TypeError):
+        logging.exception("Error while saving JSON data")
+
+
 def get_datestamp() -> int:
     """Return the current date as a UNIX timestamp in days since epoch."""
     return int(datetime.now(tz=UTC).timestamp()) // 86400